@@ -0,0 +1,71 @@
+"""shared_to moved to file_shared_users join table
+
+Revision ID: b41f7c2d9e10
+Revises: 6c2dc9a14062
+Create Date: 2025-06-02 18:21:04.512338
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b41f7c2d9e10"
+down_revision: Union[str, None] = "6c2dc9a14062"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "file_shared_users",
+        sa.Column("file_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["file_id"],
+            ["files.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("file_id", "user_id"),
+    )
+    op.create_index("idx_file_shared_users_user_file", "file_shared_users", ["user_id", "file_id"])
+
+    # usernames stored as a JSON list are resolved to user ids
+    op.execute(
+        """
+        INSERT OR IGNORE INTO file_shared_users (file_id, user_id)
+        SELECT files.id, users.id
+        FROM files, json_each(files.shared_to)
+        JOIN users ON users.username = json_each.value
+        WHERE files.shared_to IS NOT NULL AND json_valid(files.shared_to)
+        """
+    )
+
+    with op.batch_alter_table("files", schema=None) as batch_op:
+        batch_op.drop_column("shared_to")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("files", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("shared_to", sa.TEXT(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE files SET shared_to = (
+            SELECT json_group_array(users.username)
+            FROM file_shared_users
+            JOIN users ON users.id = file_shared_users.user_id
+            WHERE file_shared_users.file_id = files.id
+        )
+        WHERE id IN (SELECT file_id FROM file_shared_users)
+        """
+    )
+
+    op.drop_index("idx_file_shared_users_user_file", table_name="file_shared_users")
+    op.drop_table("file_shared_users")
@@ -0,0 +1,71 @@
+"""parent/name lookup indexes
+
+Revision ID: c7e2a9f4d135
+Revises: b41f7c2d9e10
+Create Date: 2025-06-03 10:42:17.903214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2a9f4d135"
+down_revision: Union[str, None] = "b41f7c2d9e10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the old check-then-insert could leave siblings with the same name; keep the oldest
+    # under its name and suffix the others with their id, so no folder or file is lost
+    op.execute(
+        """
+        UPDATE folders
+        SET name = name || ' (' || id || ')'
+        WHERE parent_folder_id IS NOT NULL
+          AND rowid NOT IN (
+            SELECT MIN(rowid) FROM folders
+            WHERE parent_folder_id IS NOT NULL
+            GROUP BY parent_folder_id, name
+          )
+        """
+    )
+    op.execute(
+        """
+        UPDATE files
+        SET name = name || ' (' || id || ')'
+        WHERE rowid NOT IN (
+          SELECT MIN(rowid) FROM files
+          GROUP BY folder_id, name
+        )
+        """
+    )
+
+    with op.batch_alter_table("folders", schema=None) as batch_op:
+        batch_op.create_index("idx_folders_parent_name", ["parent_folder_id", "name"], unique=True)
+
+    with op.batch_alter_table("files", schema=None) as batch_op:
+        batch_op.create_index("idx_files_parent_name", ["folder_id", "name"], unique=True)
+
+    with op.batch_alter_table("links", schema=None) as batch_op:
+        batch_op.create_index("idx_links_folder_id", ["folder_id"], unique=False)
+
+    with op.batch_alter_table("shared_files", schema=None) as batch_op:
+        batch_op.create_index("idx_shared_files_user_file", ["user_id", "file_id"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("shared_files", schema=None) as batch_op:
+        batch_op.drop_index("idx_shared_files_user_file")
+
+    with op.batch_alter_table("links", schema=None) as batch_op:
+        batch_op.drop_index("idx_links_folder_id")
+
+    with op.batch_alter_table("files", schema=None) as batch_op:
+        batch_op.drop_index("idx_files_parent_name")
+
+    with op.batch_alter_table("folders", schema=None) as batch_op:
+        batch_op.drop_index("idx_folders_parent_name")
@@ -0,0 +1,43 @@
+"""unique link per target file and owner
+
+Revision ID: d3f8b6a1e274
+Revises: c7e2a9f4d135
+Create Date: 2025-06-04 09:12:45.118604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f8b6a1e274"
+down_revision: Union[str, None] = "c7e2a9f4d135"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep the oldest link when an owner ended up with several links to one file
+    op.execute(
+        """
+        DELETE FROM links
+        WHERE target_file_id IS NOT NULL
+          AND rowid NOT IN (
+            SELECT MIN(rowid) FROM links
+            WHERE target_file_id IS NOT NULL
+            GROUP BY target_file_id, owner_id
+          )
+        """
+    )
+
+    with op.batch_alter_table("links", schema=None) as batch_op:
+        batch_op.create_index(
+            "idx_links_target_file_owner", ["target_file_id", "owner_id"], unique=True
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("links", schema=None) as batch_op:
+        batch_op.drop_index("idx_links_target_file_owner")
@@ -0,0 +1,56 @@
+"""cascade folder and file deletes
+
+Revision ID: e5a1c3d7f902
+Revises: d3f8b6a1e274
+Create Date: 2025-06-05 14:27:03.561920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a1c3d7f902"
+down_revision: Union[str, None] = "d3f8b6a1e274"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite foreign keys are unnamed; the convention names them during the batch copy
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+cascading_foreign_keys = {
+    "folders": [("parent_folder_id", "folders")],
+    "files": [("folder_id", "folders")],
+    "links": [
+        ("folder_id", "folders"),
+        ("target_file_id", "files"),
+        ("target_folder_id", "folders"),
+    ],
+    "shared_files": [("file_id", "files")],
+    "file_shared_users": [("file_id", "files")],
+}
+
+
+def _set_ondelete(ondelete: Union[str, None]) -> None:
+    for table, foreign_keys in cascading_foreign_keys.items():
+        with op.batch_alter_table(
+            table, schema=None, naming_convention=naming_convention
+        ) as batch_op:
+            for column, referred_table in foreign_keys:
+                name = f"fk_{table}_{column}_{referred_table}"
+                batch_op.drop_constraint(name, type_="foreignkey")
+                batch_op.create_foreign_key(
+                    name, referred_table, [column], ["id"], ondelete=ondelete
+                )
+
+
+def upgrade() -> None:
+    _set_ondelete("CASCADE")
+
+
+def downgrade() -> None:
+    _set_ondelete(None)
@@ -1,7 +1,7 @@
 from enum import Enum as PyEnum
 from dataclasses import dataclass
-from typing import IO
-from pydantic import BaseModel
+from typing import IO, Iterator
+from pydantic import BaseModel, ConfigDict
 
 
 class Privacy(str, PyEnum):
@@ -22,12 +22,18 @@ class ResourceType(str, PyEnum):
     LINK = "link"
 
 
+# response models are built once from database entities and never modified afterwards
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra="forbid")
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
 
 
 class Folder(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     name: str
     path: str
@@ -36,6 +42,8 @@ class Folder(BaseModel):
 
 
 class File(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     name: str
     path: str
@@ -46,12 +54,16 @@ class File(BaseModel):
 
 
 class Link(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     name: str
     path: str
 
 
 class FolderContents(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     folder_name: str
     folder_path: str
     files: list[File]
@@ -68,7 +80,7 @@ class FileData:
 @dataclass
 class FolderData:
     name: str
-    data: IO[bytes]
+    data: Iterator[bytes]
 
 
 class LoginUserRequest(BaseModel):
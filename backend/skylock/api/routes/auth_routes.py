@@ -124,7 +124,7 @@ def authenticate_user(
     },
 )
 @limiter.limit(DEFAULT_RATE_LIMIT)
-async def login_user(
+def login_user(
     request: Request,
     payload: models.LoginUserRequest,
     skylock: Annotated[SkylockFacade, Depends(get_skylock_facade)],
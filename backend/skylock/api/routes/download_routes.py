@@ -8,6 +8,7 @@ from skylock.api.validation import validate_path_not_empty
 from skylock.skylock_facade import SkylockFacade
 from skylock.database import models as db_models
 from skylock.utils.path import UserPath
+from skylock.utils.storage import iter_chunks
 
 
 router = APIRouter(tags=["Resource", "Download"], prefix="/download")
@@ -76,7 +77,7 @@ def download_file(
     user_path = UserPath(path=path, owner=user)
     file_data = skylock.download_file(user_path)
     return StreamingResponse(
-        content=file_data.data,
+        content=iter_chunks(file_data.data),
         media_type="application/octet-stream",
         headers={"Content-Disposition": f'attachment; filename="{file_data.name}"'},
     )
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
 from skylock.api import models
 from skylock.api.dependencies import get_current_user, get_skylock_facade
@@ -15,6 +15,7 @@ router = APIRouter(tags=["Resource"], prefix="/folders")
 
 @router.get(
     "/{path:path}",
+    response_model=models.FolderContents,
     summary="Get folder contents",
     description=(
         """
@@ -86,8 +87,11 @@ def get_folder_contents(
     path: str,
     user: Annotated[db_models.UserEntity, Depends(get_current_user)],
     skylock: Annotated[SkylockFacade, Depends(get_skylock_facade)],
-) -> models.FolderContents:
-    return skylock.get_folder_contents(UserPath(path=path, owner=user))
+) -> Response:
+    # Listings are built without validation, so they are serialized once here
+    # instead of going through FastAPI's response-model round trip.
+    contents = skylock.get_folder_contents(UserPath(path=path, owner=user))
+    return Response(content=contents.model_dump_json(), media_type="application/json")
 
 
 @router.post(
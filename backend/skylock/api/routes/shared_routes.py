@@ -6,6 +6,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from skylock.api.dependencies import get_skylock_facade
 from skylock.skylock_facade import SkylockFacade
+from skylock.utils.storage import iter_chunks
 
 router = APIRouter(tags=["Resource"], prefix="/shared")
 
@@ -44,7 +45,7 @@ def download_shared_file_by_id(
     file_data = skylock.download_shared_file_by_id(file_id, token)
 
     return StreamingResponse(
-        content=file_data.data,
+        content=iter_chunks(file_data.data),
         media_type="application/octet-stream",
         headers={"Content-Disposition": f'attachment; filename="{file_data.name}"'},
     )
@@ -83,7 +84,7 @@ def download_shared_file_by_path(
     file_data = skylock.download_shared_file_by_path(path, token)
 
     return StreamingResponse(
-        content=file_data.data,
+        content=iter_chunks(file_data.data),
         media_type="application/octet-stream",
         headers={"Content-Disposition": f'attachment; filename="{file_data.name}"'},
     )
@@ -58,11 +58,9 @@ def upload_file(
     force: bool = False,
     privacy: Privacy = Privacy.PRIVATE,
 ) -> models.File:
-    size = file.size if file.size else 0
     return skylock.upload_file(
         user_path=UserPath(path=path, owner=user),
-        file_data=file.file.read(),
-        size=size,
+        file_data=file.file,
         force=force,
         privacy=privacy,
     )
@@ -10,6 +10,7 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/db.sqlite")
 
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
 REDIS_DB_RATELIMIT: int = int(os.getenv("REDIS_DB_RATELIMIT", "0"))
 REDIS_URL_RATELIMIT: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB_RATELIMIT}"
 
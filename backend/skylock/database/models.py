@@ -1,8 +1,6 @@
 import uuid
-import json
 from typing import Optional, List
-from sqlalchemy import orm, ForeignKey
-from sqlalchemy.dialects.sqlite import TEXT
+from sqlalchemy import orm, Column, ForeignKey, Index, Table
 from skylock.api.models import Privacy, FolderType
 
 
@@ -16,6 +14,15 @@ class Base(orm.DeclarativeBase):
 metadata = Base.metadata
 
 
+file_shared_users = Table(
+    "file_shared_users",
+    metadata,
+    Column("file_id", ForeignKey("files.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", ForeignKey("users.id"), primary_key=True),
+    Index("idx_file_shared_users_user_file", "user_id", "file_id"),
+)
+
+
 class UserEntity(Base):
     __tablename__ = "users"
 
@@ -24,21 +31,24 @@ class UserEntity(Base):
     email: orm.Mapped[str] = orm.mapped_column(unique=True, nullable=True)
 
     folders: orm.Mapped[List["FolderEntity"]] = orm.relationship(
-        "FolderEntity", back_populates="owner", lazy="selectin"
+        "FolderEntity", back_populates="owner", lazy="raise"
     )
     files: orm.Mapped[List["FileEntity"]] = orm.relationship(
-        "FileEntity", back_populates="owner", lazy="selectin"
+        "FileEntity", back_populates="owner", lazy="raise"
     )
     shared_files: orm.Mapped[List["SharedFileEntity"]] = orm.relationship(
-        back_populates="user", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="user", lazy="raise", cascade="all, delete-orphan"
     )
 
 
 class FolderEntity(Base):
     __tablename__ = "folders"
+    __table_args__ = (Index("idx_folders_parent_name", "parent_folder_id", "name", unique=True),)
 
     name: orm.Mapped[str] = orm.mapped_column(nullable=False)
-    parent_folder_id: orm.Mapped[Optional[str]] = orm.mapped_column(ForeignKey("folders.id"))
+    parent_folder_id: orm.Mapped[Optional[str]] = orm.mapped_column(
+        ForeignKey("folders.id", ondelete="CASCADE")
+    )
     owner_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("users.id"))
     privacy: orm.Mapped[str] = orm.mapped_column(nullable=False, default=Privacy.PRIVATE)
     type: orm.Mapped[str] = orm.mapped_column(nullable=False, default=FolderType.NORMAL)
@@ -49,19 +59,30 @@ class FolderEntity(Base):
         "FolderEntity", remote_side="FolderEntity.id", back_populates="subfolders"
     )
 
+    # the contents of a folder are removed by ON DELETE CASCADE in the database
     files: orm.Mapped[List["FileEntity"]] = orm.relationship(
-        "FileEntity", back_populates="folder", lazy="selectin"
+        "FileEntity",
+        back_populates="folder",
+        lazy="raise",
+        cascade="save-update, merge, delete",
+        passive_deletes=True,
     )
 
     subfolders: orm.Mapped[List["FolderEntity"]] = orm.relationship(
-        "FolderEntity", back_populates="parent_folder", lazy="selectin"
+        "FolderEntity",
+        back_populates="parent_folder",
+        lazy="raise",
+        cascade="save-update, merge, delete",
+        passive_deletes=True,
     )
 
     links: orm.Mapped[List["LinkEntity"]] = orm.relationship(
         "LinkEntity",
         back_populates="folder",
-        lazy="selectin",
+        lazy="raise",
         foreign_keys="LinkEntity.folder_id",
+        cascade="save-update, merge, delete",
+        passive_deletes=True,
     )
 
     def is_root(self) -> bool:
@@ -70,35 +91,35 @@ class FolderEntity(Base):
 
 class FileEntity(Base):
     __tablename__ = "files"
+    __table_args__ = (Index("idx_files_parent_name", "folder_id", "name", unique=True),)
 
     name: orm.Mapped[str] = orm.mapped_column(nullable=False)
-    folder_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("folders.id"))
+    folder_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("folders.id", ondelete="CASCADE"))
     owner_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("users.id"))
     privacy: orm.Mapped[str] = orm.mapped_column(nullable=False, default=Privacy.PRIVATE)
-    __shared_to: orm.Mapped[Optional[str]] = orm.mapped_column(TEXT, default=None, name="shared_to")
     size: orm.Mapped[int] = orm.mapped_column(nullable=False)
 
     folder: orm.Mapped[FolderEntity] = orm.relationship("FolderEntity", back_populates="files")
     owner: orm.Mapped[UserEntity] = orm.relationship("UserEntity", back_populates="files")
     shared_with: orm.Mapped[List["SharedFileEntity"]] = orm.relationship(
-        back_populates="file", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="file", lazy="raise", cascade="all, delete-orphan", passive_deletes=True
+    )
+    shared_users: orm.Mapped[List[UserEntity]] = orm.relationship(
+        secondary=file_shared_users, lazy="select", passive_deletes=True
     )
 
-    def _set_shared_to(self, value: set[str]):
-        self.__shared_to = json.dumps(list(value))
-
-    def _get_shared_to(self) -> set[str]:
-        if self.__shared_to:
-            return set(json.loads(self.__shared_to))
-        return set()
-
-    shared_to = property(_get_shared_to, _set_shared_to)
+    @property
+    def shared_to(self) -> set[str]:
+        return {user.username for user in self.shared_users}
 
 
 class SharedFileEntity(Base):
     __tablename__ = "shared_files"
+    __table_args__ = (Index("idx_shared_files_user_file", "user_id", "file_id"),)
 
-    file_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("files.id"), primary_key=True)
+    file_id: orm.Mapped[str] = orm.mapped_column(
+        ForeignKey("files.id", ondelete="CASCADE"), primary_key=True
+    )
     user_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("users.id"), primary_key=True)
 
     file: orm.Mapped[FileEntity] = orm.relationship("FileEntity", back_populates="shared_with")
@@ -107,16 +128,22 @@ class SharedFileEntity(Base):
 
 class LinkEntity(Base):
     __tablename__ = "links"
+    __table_args__ = (
+        Index("idx_links_folder_id", "folder_id"),
+        Index("idx_links_target_file_owner", "target_file_id", "owner_id", unique=True),
+    )
 
     name: orm.Mapped[str] = orm.mapped_column(nullable=False)
-    folder_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("folders.id"), nullable=False)
+    folder_id: orm.Mapped[str] = orm.mapped_column(
+        ForeignKey("folders.id", ondelete="CASCADE"), nullable=False
+    )
     owner_id: orm.Mapped[str] = orm.mapped_column(ForeignKey("users.id"), nullable=False)
     resource_type: orm.Mapped[str] = orm.mapped_column(nullable=False)
     target_file_id: orm.Mapped[Optional[str]] = orm.mapped_column(
-        ForeignKey("files.id"), nullable=True
+        ForeignKey("files.id", ondelete="CASCADE"), nullable=True
     )
     target_folder_id: orm.Mapped[Optional[str]] = orm.mapped_column(
-        ForeignKey("folders.id"), nullable=True
+        ForeignKey("folders.id", ondelete="CASCADE"), nullable=True
     )  # currently not used
 
     target_file: orm.Mapped[Optional["FileEntity"]] = orm.relationship(
@@ -1,13 +1,72 @@
-from typing import Generic, Optional, Type, TypeVar
-
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from typing import Generic, Iterable, Iterator, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    case,
+    delete,
+    exists,
+    inspect,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import MANYTOONE, QueryableAttribute, Session, aliased, selectinload
 from sqlalchemy.orm.interfaces import ColumnElement
+from sqlalchemy.sql.base import ExecutableOption
 
+from skylock.api.models import ResourceType
 from skylock.database import models
 
 Model = TypeVar("Model", bound=models.Base)
 
+# Relationships are configured with lazy="raise"; queries opt into the collections
+# their callers consume with one of the loader option sets below.
+FOLDER_CONTENTS: Sequence[ExecutableOption] = (
+    selectinload(models.FolderEntity.files),
+    selectinload(models.FolderEntity.subfolders),
+    selectinload(models.FolderEntity.links),
+)
+FOLDER_LINKS: Sequence[ExecutableOption] = (selectinload(models.FolderEntity.links),)
+FILE_SHARING: Sequence[ExecutableOption] = (
+    selectinload(models.FileEntity.shared_with).joinedload(models.SharedFileEntity.user),
+)
+
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """Groups repository writes made within the block into a single transaction.
+
+    While a unit of work is active, repository saves and deletes only flush the
+    session. The outermost block commits once on exit, or rolls back if an
+    exception escapes it. Autoflush is disabled for the duration of the block.
+
+    Args:
+        session (Session): The SQLAlchemy session.
+
+    Yields:
+        Session: The same session.
+    """
+    depth = session.info.get(UNIT_OF_WORK_DEPTH, 0)
+    session.info[UNIT_OF_WORK_DEPTH] = depth + 1
+    try:
+        with session.no_autoflush:
+            yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[UNIT_OF_WORK_DEPTH] = depth
+
 
 class DatabaseRepository(Generic[Model]):
     """Generic repository for database operations on a specific model."""
@@ -22,6 +81,24 @@ class DatabaseRepository(Generic[Model]):
         self.model = model
         self.session = session
 
+    def unit_of_work(self):
+        """Opens a unit of work on the repository's session.
+
+        Returns:
+            A context manager deferring commits until the outermost block exits.
+        """
+        return unit_of_work(self.session)
+
+    def _in_unit_of_work(self) -> bool:
+        return self.session.info.get(UNIT_OF_WORK_DEPTH, 0) > 0
+
+    def _commit(self) -> None:
+        """Commits the session, or only flushes it inside a unit of work."""
+        if self._in_unit_of_work():
+            self.session.flush()
+        else:
+            self.session.commit()
+
     def save(self, entity: Model) -> Model:
         """Saves an entity to the database.
 
@@ -32,19 +109,28 @@ class DatabaseRepository(Generic[Model]):
             Model: The saved and refreshed entity instance.
         """
         self.session.add(entity)
-        self.session.commit()
-        self.session.refresh(entity)
+        if self._in_unit_of_work():
+            self.session.flush()
+        else:
+            self.session.commit()
+            self.session.refresh(entity)
         return entity
 
-    def get_by_id(self, entity_id: str) -> Optional[Model]:
+    def get_by_id(
+        self, entity_id: str, options: Sequence[ExecutableOption] = ()
+    ) -> Optional[Model]:
         """Retrieves an entity by its primary key ID.
 
         Args:
             entity_id (str): The ID of the entity to retrieve.
+            options (Sequence[ExecutableOption]): Loader options for the query.
 
         Returns:
             Optional[Model]: The entity instance if found, otherwise None.
         """
+        if options:
+            # Session.get skips loader options for entities already in the identity map
+            return self.filter_one_or_none(self.model.id == entity_id, options=options)
         return self.session.get(self.model, entity_id)
 
     def delete(self, entity: Model) -> None:
@@ -54,32 +140,58 @@ class DatabaseRepository(Generic[Model]):
             entity (Model): The entity instance to delete.
         """
         self.session.delete(entity)
-        self.session.commit()
+        if self._in_unit_of_work():
+            self.session.flush()
+            self._expire_parent_collections(entity)
+        else:
+            self.session.commit()
+
+    def _expire_parent_collections(self, entity: Model) -> None:
+        """Expires collections of loaded parent entities that still hold a deleted entity."""
+        state = inspect(entity)
+        for relationship in state.mapper.relationships:
+            if relationship.direction is not MANYTOONE or not relationship.back_populates:
+                continue
+            foreign_key = state.mapper.get_property_by_column(
+                next(iter(relationship.local_columns))
+            )
+            parent_key = relationship.mapper.identity_key_from_primary_key(
+                (getattr(entity, foreign_key.key),)
+            )
+            parent = self.session.identity_map.get(parent_key)
+            if parent is not None:
+                self.session.expire(parent, [relationship.back_populates])
 
-    def filter(self, *expressions: ColumnElement) -> list[Model]:
+    def filter(
+        self, *expressions: ColumnElement, options: Sequence[ExecutableOption] = ()
+    ) -> list[Model]:
         """Filters entities based on given SQLAlchemy expressions.
 
         Args:
             *expressions (ColumnElement): SQLAlchemy filter expressions.
+            options (Sequence[ExecutableOption]): Loader options for the query.
 
         Returns:
             list[Model]: A list of entity instances matching the criteria.
         """
-        query = select(self.model)
+        query = select(self.model).options(*options)
         if expressions:
             query = query.where(*expressions)
         return list(self.session.execute(query).scalars())
 
-    def filter_one_or_none(self, *expressions: ColumnElement) -> Optional[Model]:
+    def filter_one_or_none(
+        self, *expressions: ColumnElement, options: Sequence[ExecutableOption] = ()
+    ) -> Optional[Model]:
         """Filters for one entity or none based on given SQLAlchemy expressions.
 
         Args:
             *expressions (ColumnElement): SQLAlchemy filter expressions.
+            options (Sequence[ExecutableOption]): Loader options for the query.
 
         Returns:
             Optional[Model]: A single entity instance if found, otherwise None.
         """
-        query = select(self.model)
+        query = select(self.model).options(*options)
         if expressions:
             query = query.where(*expressions)
         return self.session.execute(query).scalar_one_or_none()
@@ -118,6 +230,60 @@ class UserRepository(DatabaseRepository[models.UserEntity]):
         """
         return self.filter_one_or_none(models.UserEntity.email == email)
 
+    def is_username_or_email_taken(self, username: str, email: str) -> bool:
+        """Checks with a single query if a username or an email address is already in use.
+
+        Args:
+            username (str): The username to check.
+            email (str): The email address to check.
+
+        Returns:
+            bool: True if a user has the username or the email address, False otherwise.
+        """
+        query = select(
+            exists().where(
+                or_(models.UserEntity.username == username, models.UserEntity.email == email)
+            )
+        )
+        return bool(self.session.execute(query).scalar())
+
+    def get_existing_usernames(self, usernames: Iterable[str]) -> set[str]:
+        """Retrieves which of the given usernames belong to existing users.
+
+        Args:
+            usernames (Iterable[str]): The usernames to check.
+
+        Returns:
+            set[str]: The usernames that have a matching user.
+        """
+        query = select(models.UserEntity.username).where(
+            models.UserEntity.username.in_(list(usernames))
+        )
+        return set(self.session.execute(query).scalars())
+
+    def insert_unique(self, **values) -> Optional[models.UserEntity]:
+        """Inserts a user unless the username or the email address is already taken.
+
+        The check is left to the unique username and email constraints, so two
+        concurrent registrations cannot both succeed.
+
+        Args:
+            **values: Column values of the new user.
+
+        Returns:
+            Optional[models.UserEntity]: The created user entity, or None if the username
+            or the email address is already in use.
+        """
+        query = (
+            insert(models.UserEntity)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(models.UserEntity)
+        )
+        user = self.session.execute(query).scalar_one_or_none()
+        self._commit()
+        return user
+
 
 class FolderRepository(DatabaseRepository[models.FolderEntity]):
     """Repository for FolderEntity database operations."""
@@ -131,13 +297,14 @@ class FolderRepository(DatabaseRepository[models.FolderEntity]):
         super().__init__(models.FolderEntity, session)
 
     def get_by_name_and_parent_id(
-        self, name: str, parent_id: str | None
+        self, name: str, parent_id: str | None, options: Sequence[ExecutableOption] = ()
     ) -> Optional[models.FolderEntity]:
         """Retrieves a folder by its name and parent folder ID.
 
         Args:
             name (str): The name of the folder.
             parent_id (str | None): The ID of the parent folder, or None for root.
+            options (Sequence[ExecutableOption]): Loader options for the query.
 
         Returns:
             Optional[models.FolderEntity]: The folder entity if found, otherwise None.
@@ -145,7 +312,212 @@ class FolderRepository(DatabaseRepository[models.FolderEntity]):
         return self.filter_one_or_none(
             models.FolderEntity.parent_folder_id == parent_id,
             models.FolderEntity.name == name,
+            options=options,
+        )
+
+    def get_deepest_on_path(
+        self, root_name: str, names: Sequence[str]
+    ) -> Optional[tuple[models.FolderEntity, int]]:
+        """Retrieves the deepest existing folder along a path with one recursive query.
+
+        Args:
+            root_name (str): The name of the root folder the path starts from.
+            names (Sequence[str]): The folder names along the path, outermost first.
+
+        Returns:
+            Optional[tuple[models.FolderEntity, int]]: The deepest existing folder and the
+                number of names it covers, or None if the root folder does not exist.
+        """
+        anchor = select(models.FolderEntity.id, literal(0, Integer).label("depth")).where(
+            models.FolderEntity.parent_folder_id.is_(None),
+            models.FolderEntity.name == root_name,
         )
+        anchor_cte = anchor.cte("path", recursive=bool(names))
+        path = anchor_cte
+        if names:
+            next_name = case(dict(enumerate(names, start=1)), value=anchor_cte.c.depth + 1)
+            path = anchor_cte.union_all(
+                select(models.FolderEntity.id, anchor_cte.c.depth + 1).where(
+                    models.FolderEntity.parent_folder_id == anchor_cte.c.id,
+                    models.FolderEntity.name == next_name,
+                )
+            )
+        query = (
+            select(models.FolderEntity, path.c.depth)
+            .join(path, models.FolderEntity.id == path.c.id)
+            .order_by(path.c.depth.desc())
+            .limit(1)
+        )
+        row = self.session.execute(query).first()
+        return None if row is None else (row[0], row[1])
+
+    def collect_descendant_ids(self, folder_id: str, skip_types: Iterable[str] = ()) -> list[str]:
+        """Collects the IDs of all folders nested under a folder with one recursive query.
+
+        Args:
+            folder_id (str): The ID of the folder whose subtree is collected.
+            skip_types (Iterable[str]): Folder types that are left out together with their subtrees.
+
+        Returns:
+            list[str]: The IDs of all descendant folders, excluding the folder itself.
+        """
+        query = self._descendant_ids(folder_id, skip_types)
+        return list(self.session.execute(query).scalars())
+
+    def get_subtree(self, folder_id: str) -> Optional[models.FolderEntity]:
+        """Retrieves a folder with all nested folders, files and links loaded.
+
+        The whole subtree is fetched in a fixed number of queries regardless of its depth:
+        the folders in one query and each child collection with one IN query across all of them.
+
+        Args:
+            folder_id (str): The ID of the subtree's root folder.
+
+        Returns:
+            Optional[models.FolderEntity]: The root folder entity if found, otherwise None.
+        """
+        folders = self.filter(
+            (models.FolderEntity.id == folder_id)
+            | models.FolderEntity.id.in_(self._descendant_ids(folder_id)),
+            options=FOLDER_CONTENTS,
+        )
+        return next((folder for folder in folders if folder.id == folder_id), None)
+
+    def bulk_set_privacy(self, folder_ids: Iterable[str], privacy: str) -> None:
+        """Sets the privacy of many folders with a single statement.
+
+        Args:
+            folder_ids (Iterable[str]): The IDs of the folders to update.
+            privacy (str): The new privacy setting.
+        """
+        self.session.execute(
+            update(models.FolderEntity)
+            .where(models.FolderEntity.id.in_(list(folder_ids)))
+            .values(privacy=privacy)
+        )
+        self._commit()
+
+    def _descendant_ids(self, folder_id: str, skip_types: Iterable[str] = ()) -> Select:
+        skip_types = list(skip_types)
+        tree = (
+            select(models.FolderEntity.id)
+            .where(
+                models.FolderEntity.parent_folder_id == folder_id,
+                models.FolderEntity.type.not_in(skip_types),
+            )
+            .cte("tree", recursive=True)
+        )
+        tree = tree.union_all(
+            select(models.FolderEntity.id).where(
+                models.FolderEntity.parent_folder_id == tree.c.id,
+                models.FolderEntity.type.not_in(skip_types),
+            )
+        )
+        return select(tree.c.id)
+
+    def find_child(self, parent_id: str, name: str) -> Optional[tuple[ResourceType, str]]:
+        """Finds a file, link or subfolder of the given name in a folder with a single query.
+
+        Files take precedence over links, and links over subfolders.
+
+        Args:
+            parent_id (str): The ID of the parent folder.
+            name (str): The name of the child.
+
+        Returns:
+            Optional[tuple[ResourceType, str]]: The type and ID of the child if found,
+                otherwise None.
+        """
+        children = union_all(
+            select(literal(0).label("rank"), literal(ResourceType.FILE.value).label("type"))
+            .add_columns(models.FileEntity.id)
+            .where(models.FileEntity.folder_id == parent_id, models.FileEntity.name == name),
+            select(literal(1), literal(ResourceType.LINK.value))
+            .add_columns(models.LinkEntity.id)
+            .where(models.LinkEntity.folder_id == parent_id, models.LinkEntity.name == name),
+            select(literal(2), literal(ResourceType.FOLDER.value))
+            .add_columns(models.FolderEntity.id)
+            .where(
+                models.FolderEntity.parent_folder_id == parent_id, models.FolderEntity.name == name
+            ),
+        ).subquery()
+        query = select(children.c.type, children.c.id).order_by(children.c.rank).limit(1)
+        row = self.session.execute(query).first()
+        if row is None:
+            return None
+        return ResourceType(row.type), row.id
+
+    def child_name_exists(self, parent_id: str, name: str) -> bool:
+        """Checks if a folder already holds a file or subfolder with the given name.
+
+        Args:
+            parent_id (str): The ID of the parent folder.
+            name (str): The name to look for.
+
+        Returns:
+            bool: True if a file or subfolder of that name exists, False otherwise.
+        """
+        query = select(
+            exists().where(models.FileEntity.folder_id == parent_id, models.FileEntity.name == name)
+            | exists().where(
+                models.FolderEntity.parent_folder_id == parent_id, models.FolderEntity.name == name
+            )
+        )
+        return bool(self.session.execute(query).scalar())
+
+    def has_children(self, folder_id: str) -> bool:
+        """Checks if a folder contains any subfolder, file or link.
+
+        Args:
+            folder_id (str): The ID of the folder.
+
+        Returns:
+            bool: True if the folder is not empty, False otherwise.
+        """
+        query = select(self._has_children(folder_id))
+        return bool(self.session.execute(query).scalar())
+
+    def delete_empty(self, folder_ids: Iterable[str], folder_type: str) -> None:
+        """Deletes those of the given folders of a type that have no children left.
+
+        Args:
+            folder_ids (Iterable[str]): The IDs of the candidate folders.
+            folder_type (str): The type a folder must have to be deleted.
+        """
+        folder_ids = list(folder_ids)
+        if not folder_ids:
+            return
+        self.session.execute(
+            delete(models.FolderEntity).where(
+                models.FolderEntity.id.in_(folder_ids),
+                models.FolderEntity.type == folder_type,
+                ~self._has_children(models.FolderEntity.id),
+            )
+        )
+        self._commit()
+
+    @staticmethod
+    def _has_children(
+        folder_id: str | ColumnElement[str] | QueryableAttribute[str],
+    ) -> ColumnElement[bool]:
+        subfolder = aliased(models.FolderEntity)
+        return (
+            exists().where(subfolder.parent_folder_id == folder_id)
+            | exists().where(models.FileEntity.folder_id == folder_id)
+            | exists().where(models.LinkEntity.folder_id == folder_id)
+        )
+
+    def delete_by_id(self, folder_id: str) -> None:
+        """Deletes a folder with a single statement.
+
+        Its subfolders, files and links, and the sharing entries and links of those
+        files, are removed by ON DELETE CASCADE.
+
+        Args:
+            folder_id (str): The ID of the folder to delete.
+        """
+        self.session.execute(delete(models.FolderEntity).where(models.FolderEntity.id == folder_id))
+        self._commit()
 
 
 class FileRepository(DatabaseRepository[models.FileEntity]):
@@ -160,20 +532,108 @@ class FileRepository(DatabaseRepository[models.FileEntity]):
         super().__init__(models.FileEntity, session)
 
     def get_by_name_and_parent(
-        self, name: str, parent: models.FolderEntity
+        self,
+        name: str,
+        parent: models.FolderEntity,
+        options: Sequence[ExecutableOption] = (),
     ) -> Optional[models.FileEntity]:
         """Retrieves a file by its name and parent folder.
 
         Args:
             name (str): The name of the file.
             parent (models.FolderEntity): The parent folder entity.
+            options (Sequence[ExecutableOption]): Loader options for the query.
 
         Returns:
             Optional[models.FileEntity]: The file entity if found, otherwise None.
         """
         return self.filter_one_or_none(
-            models.FileEntity.name == name, models.FileEntity.folder == parent
+            models.FileEntity.name == name, models.FileEntity.folder == parent, options=options
+        )
+
+    def name_exists_in_folder(self, folder_id: str, name: str) -> bool:
+        """Checks if a folder holds a file with the given name.
+
+        Args:
+            folder_id (str): The ID of the folder.
+            name (str): The file name to look for.
+
+        Returns:
+            bool: True if such a file exists, False otherwise.
+        """
+        query = select(
+            exists().where(models.FileEntity.folder_id == folder_id, models.FileEntity.name == name)
+        )
+        return bool(self.session.execute(query).scalar())
+
+    def bulk_set_privacy_by_folder_ids(self, folder_ids: Iterable[str], privacy: str) -> None:
+        """Sets the privacy of all files stored directly in the given folders.
+
+        Args:
+            folder_ids (Iterable[str]): The IDs of the folders holding the files.
+            privacy (str): The new privacy setting.
+        """
+        self.session.execute(
+            update(models.FileEntity)
+            .where(models.FileEntity.folder_id.in_(list(folder_ids)))
+            .values(privacy=privacy)
+        )
+        self._commit()
+
+    def get_ids_by_folder_ids(self, folder_ids: Iterable[str]) -> list[str]:
+        """Retrieves the IDs of all files stored directly in the given folders.
+
+        Args:
+            folder_ids (Iterable[str]): The IDs of the folders.
+
+        Returns:
+            list[str]: The IDs of the files in those folders.
+        """
+        query = select(models.FileEntity.id).where(
+            models.FileEntity.folder_id.in_(list(folder_ids))
+        )
+        return list(self.session.execute(query).scalars())
+
+    def is_shared_with(self, file_id: str, user_id: str) -> bool:
+        """Checks if a file is shared with a specific user.
+
+        Args:
+            file_id (str): The ID of the file.
+            user_id (str): The ID of the user.
+
+        Returns:
+            bool: True if the file is shared with the user, False otherwise.
+        """
+        query = select(
+            exists().where(
+                models.file_shared_users.c.file_id == file_id,
+                models.file_shared_users.c.user_id == user_id,
+            )
         )
+        return bool(self.session.execute(query).scalar())
+
+    def set_shared_users(self, file_id: str, usernames: Iterable[str]) -> None:
+        """Replaces the set of users a file is shared with.
+
+        The statements run in the current transaction and are committed with the next save.
+
+        Args:
+            file_id (str): The ID of the file.
+            usernames (Iterable[str]): The usernames the file should be shared with.
+        """
+        usernames = list(usernames)
+        self.session.execute(
+            delete(models.file_shared_users).where(models.file_shared_users.c.file_id == file_id)
+        )
+        if usernames:
+            self.session.execute(
+                insert(models.file_shared_users).from_select(
+                    ["file_id", "user_id"],
+                    select(literal(file_id), models.UserEntity.id).where(
+                        models.UserEntity.username.in_(usernames)
+                    ),
+                )
+            )
 
 
 class SharedFileRepository(DatabaseRepository[models.SharedFileEntity]):
@@ -230,6 +690,42 @@ class SharedFileRepository(DatabaseRepository[models.SharedFileEntity]):
         if shared_file:
             self.delete(shared_file)
 
+    def delete_by_file_id_and_user_ids(self, file_id: str, user_ids: Iterable[str]) -> None:
+        """Deletes the shared file entries of a single file for many users.
+
+        Args:
+            file_id (str): The ID of the file.
+            user_ids (Iterable[str]): The IDs of the users from whom the share is removed.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        self.session.execute(
+            delete(models.SharedFileEntity).where(
+                models.SharedFileEntity.file_id == file_id,
+                models.SharedFileEntity.user_id.in_(user_ids),
+            )
+        )
+        self._commit()
+
+    def delete_many(self, file_ids: Iterable[str], user_id: str) -> None:
+        """Deletes the shared file entries of many files for a single user.
+
+        Args:
+            file_ids (Iterable[str]): The IDs of the files.
+            user_id (str): The ID of the user from whom the shares are removed.
+        """
+        file_ids = list(file_ids)
+        if not file_ids:
+            return
+        self.session.execute(
+            delete(models.SharedFileEntity).where(
+                models.SharedFileEntity.user_id == user_id,
+                models.SharedFileEntity.file_id.in_(file_ids),
+            )
+        )
+        self._commit()
+
 
 class LinkRepository(DatabaseRepository[models.LinkEntity]):
     """Repository for LinkEntity database operations."""
@@ -258,21 +754,30 @@ class LinkRepository(DatabaseRepository[models.LinkEntity]):
             models.LinkEntity.name == name, models.LinkEntity.folder == parent
         )
 
-    def get_by_file_id_and_owner_id(
-        self, file_id: str, owner_id: str
-    ) -> Optional[models.LinkEntity]:
-        """Retrieves a link by its target file ID and owner ID.
+    def insert_unique(self, **values) -> Optional[models.LinkEntity]:
+        """Inserts a link unless its owner already has a link to the same file.
+
+        The duplicate check is left to the unique (target_file_id, owner_id) index,
+        so the lookup and the insert happen in a single statement.
 
         Args:
-            file_id (str): The ID of the target file.
-            owner_id (str): The ID of the link owner.
+            **values: Column values of the new link.
 
         Returns:
-            Optional[models.LinkEntity]: The link entity if found, otherwise None.
+            Optional[models.LinkEntity]: The created link entity, or None if the owner
+            already has a link to the target file.
         """
-        return self.filter_one_or_none(
-            models.LinkEntity.target_file_id == file_id, models.LinkEntity.owner_id == owner_id
+        query = (
+            insert(models.LinkEntity)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["target_file_id", "owner_id"])
+            .returning(models.LinkEntity)
         )
+        link = self.session.execute(query).scalar_one_or_none()
+        if link is not None:
+            self._expire_parent_collections(link)
+        self._commit()
+        return link
 
     def get_by_file_id(self, file_id: str) -> list[models.LinkEntity]:
         """Retrieves all links pointing to a specific file ID.
@@ -284,3 +789,77 @@ class LinkRepository(DatabaseRepository[models.LinkEntity]):
             list[models.LinkEntity]: A list of link entities.
         """
         return self.filter(models.LinkEntity.target_file_id == file_id)
+
+    def delete_by_file_id(self, file_id: str) -> list[str]:
+        """Deletes all links pointing to a specific file ID with a single statement.
+
+        Args:
+            file_id (str): The ID of the target file.
+
+        Returns:
+            list[str]: The IDs of the folders that held the deleted links.
+        """
+        result = self.session.execute(
+            delete(models.LinkEntity)
+            .where(models.LinkEntity.target_file_id == file_id)
+            .returning(models.LinkEntity.folder_id)
+        )
+        folder_ids = list(result.scalars())
+        self._commit()
+        return folder_ids
+
+    def delete_by_file_id_and_owner_ids(self, file_id: str, owner_ids: Iterable[str]) -> list[str]:
+        """Deletes the links of many owners to a specific file ID with a single statement.
+
+        Args:
+            file_id (str): The ID of the target file.
+            owner_ids (Iterable[str]): The IDs of the link owners.
+
+        Returns:
+            list[str]: The IDs of the folders that held the deleted links.
+        """
+        owner_ids = list(owner_ids)
+        if not owner_ids:
+            return []
+        result = self.session.execute(
+            delete(models.LinkEntity)
+            .where(
+                models.LinkEntity.target_file_id == file_id,
+                models.LinkEntity.owner_id.in_(owner_ids),
+            )
+            .returning(models.LinkEntity.folder_id)
+        )
+        folder_ids = list(result.scalars())
+        self._commit()
+        return folder_ids
+
+    def get_target_file_ids(self, folder_ids: Iterable[str]) -> list[str]:
+        """Retrieves the IDs of the files targeted by links in the given folders.
+
+        Args:
+            folder_ids (Iterable[str]): The IDs of the folders holding the links.
+
+        Returns:
+            list[str]: The IDs of the target files.
+        """
+        query = select(models.LinkEntity.target_file_id).where(
+            models.LinkEntity.folder_id.in_(list(folder_ids)),
+            models.LinkEntity.target_file_id.is_not(None),
+        )
+        return list(self.session.execute(query).scalars())  # type: ignore[arg-type]
+
+    def get_folder_ids_by_target_file_ids(self, file_ids: Iterable[str]) -> list[str]:
+        """Retrieves the IDs of the folders holding links to the given files.
+
+        Args:
+            file_ids (Iterable[str]): The IDs of the target files.
+
+        Returns:
+            list[str]: The distinct IDs of the folders holding the links.
+        """
+        query = (
+            select(models.LinkEntity.folder_id)
+            .where(models.LinkEntity.target_file_id.in_(list(file_ids)))
+            .distinct()
+        )
+        return list(self.session.execute(query).scalars())
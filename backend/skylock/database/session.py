@@ -1,14 +1,25 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
 from skylock.config import DATABASE_URL
 
+# created once per process so that every session draws from the same connection pool
+engine = create_engine(DATABASE_URL)
+session_factory = sessionmaker(bind=engine)
+
+
+@event.listens_for(engine, "connect")
+def _enable_foreign_keys(dbapi_connection, _connection_record):
+    """Turns on foreign key enforcement, which SQLite needs per connection for ON DELETE CASCADE."""
+    if engine.dialect.name == "sqlite":
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
 
 def get_db_session():
     """Provides a SQLAlchemy database session as a context manager.
 
-    This function creates a database engine and session factory. It yields
+    This function opens a session from the process-wide session factory. It yields
     a session, attempts to commit transactions upon successful completion
     of the `with` block, and rolls back the transaction in case of
     a SQLAlchemyError.
@@ -20,9 +31,7 @@ def get_db_session():
         SQLAlchemyError: If an error occurs during database operations,
                          the transaction is rolled back and the error is re-raised.
     """
-    engine = create_engine(DATABASE_URL)
-    factory = sessionmaker(bind=engine)
-    with factory() as session:
+    with session_factory() as session:
         try:
             yield session
             session.commit()
@@ -5,7 +5,7 @@ from fastapi.templating import Jinja2Templates
 from skylock.skylock_facade import SkylockFacade
 from skylock.utils.url_generator import UrlGenerator
 
-from skylock.utils.security import get_user_from_jwt
+from skylock.utils.security import get_user_from_jwt, strip_bearer_prefix
 from skylock.api.models import Privacy
 
 
@@ -53,22 +53,15 @@ class HtmlBuilder:
             HTMLResponse: The rendered folder contents page.
         """
         folder_contents = self._skylock.get_public_folder_contents(folder_id)
+        folders = [folder for folder in folder_contents.folders if folder.privacy == Privacy.PUBLIC]
+        files = [file for file in folder_contents.files if file.privacy == Privacy.PUBLIC]
+        folder_urls = self._url_generator.generate_urls_for_folders(folder.id for folder in folders)
+        file_urls = self._url_generator.generate_urls_for_files(file.id for file in files)
+
         public_folders = [
-            {
-                "name": folder.name,
-                "url": self._url_generator.generate_url_for_folder(folder.id),
-            }
-            for folder in folder_contents.folders
-            if folder.privacy == Privacy.PUBLIC
-        ]
-        public_files = [
-            {
-                "name": file.name,
-                "url": self._url_generator.generate_url_for_file(file.id),
-            }
-            for file in folder_contents.files
-            if file.privacy == Privacy.PUBLIC
+            {"name": folder.name, "url": url} for folder, url in zip(folders, folder_urls)
         ]
+        public_files = [{"name": file.name, "url": url} for file, url in zip(files, file_urls)]
         return self._templates.TemplateResponse(
             request,
             "folder_contents.html",
@@ -118,7 +111,7 @@ class HtmlBuilder:
         token = request.cookies.get("access_token")
 
         if token:
-            token = token.replace("Bearer ", "")
+            token = strip_bearer_prefix(token)
         else:
             return self.build_login_page(request, file_id)
         try:
@@ -128,8 +121,8 @@ class HtmlBuilder:
 
         if (
             privacy == Privacy.PROTECTED
-            and user.username not in file.shared_to
             and user.id != file.owner_id
+            and not self._skylock.is_file_shared_with(file_id, user.id)
         ):
             return self.build_login_page(request, file_id, "File not shared with you")
 
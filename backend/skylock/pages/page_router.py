@@ -75,7 +75,7 @@ def folder_contents(
     ),
 )
 @limiter.limit(DEFAULT_RATE_LIMIT)
-async def login_file_post(
+def login_file_post(
     request: Request,
     file_id: str,
     user_service: Annotated[UserService, Depends(get_user_service)],
@@ -17,21 +17,25 @@ from skylock.service.resource_service import ResourceService
 from skylock.service.zip_service import ZipService
 from skylock.utils.path import UserPath
 from skylock.api.models import Privacy
-from skylock.utils.reddis_mem import redis_mem
 from skylock.utils.exceptions import UserNotFoundException
 
 REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}"
+ZIP_QUEUE = "zip"
 
 redis_broker = RedisBroker(url=REDIS_URL)
 dramatiq.set_broker(redis_broker)
 
 
-@dramatiq.actor
-def create_zip_task(owner_id: str, folder_path: str, force: bool, task_name: str) -> None:
+# zipping runs on its own queue, so workers started with `--queues zip` can be sized for it;
+# a retry would run after the lock is released, hence no retries
+@dramatiq.actor(queue_name=ZIP_QUEUE, max_retries=0)
+def create_zip_task(
+    owner_id: str, folder_path: str, force: bool, task_name: str, lock_token: str
+) -> None:
     """Zips a folder and saves it as a new file for the owner.
 
     This background task creates a ZIP archive of the specified folder's contents
-    and stores it as a new private file. It cleans up a task-related Redis entry
+    and stores it as a new private file. It releases the task's Redis lock
     after execution.
 
     Args:
@@ -39,6 +43,7 @@ def create_zip_task(owner_id: str, folder_path: str, force: bool, task_name: str
         folder_path (str): Path to the folder to be zipped.
         force (bool): If True, overwrite if the ZIP file already exists.
         task_name (str): Name of the task for tracking/cleanup in Redis.
+        lock_token (str): Token of the task's Redis lock, needed to release it.
 
     Returns:
         None
@@ -46,6 +51,8 @@ def create_zip_task(owner_id: str, folder_path: str, force: bool, task_name: str
     Raises:
         UserNotFoundException: If the owner_id does not correspond to an existing user.
     """
+    storage = FileStorageService()
+    zip_service = ZipService(storage)
     try:
         db = next(get_db_session())
 
@@ -55,23 +62,22 @@ def create_zip_task(owner_id: str, folder_path: str, force: bool, task_name: str
         shared_repo = SharedFileRepository(db)
         link_repo = LinkRepository(db)
         path_resolver = PathResolver(file_repo, folder_repo, user_repo)
-        storage = FileStorageService()
         resource_service = ResourceService(
             file_repo, folder_repo, path_resolver, storage, user_repo, shared_repo, link_repo
         )
-        zip_service = ZipService(storage)
 
         user = user_repo.get_by_id(owner_id)
         if not user:
             raise UserNotFoundException
         user_path = UserPath(path=folder_path, owner=user)
 
-        folder = resource_service.get_folder(user_path)
+        folder = resource_service.get_folder_tree(user_path)
 
-        zip_bytes, size = zip_service.create_zip_from_folder_to_bytes(folder)
+        zip_buffer, _ = zip_service.create_zip_from_folder(folder)
         file_path = UserPath(path=folder_path + ".zip", owner=user)
-        resource_service.create_file(
-            file_path, zip_bytes, size=size, force=force, privacy=Privacy.PRIVATE
-        )
+        with zip_buffer:
+            resource_service.create_file(
+                file_path, zip_buffer, force=force, privacy=Privacy.PRIVATE
+            )
     finally:
-        redis_mem.delete(task_name)
+        zip_service.release_zip_lock(task_name, lock_token)
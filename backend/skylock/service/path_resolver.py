@@ -1,3 +1,8 @@
+from typing import Optional, Sequence
+
+from sqlalchemy.sql.base import ExecutableOption
+
+from skylock.api.models import ResourceType
 from skylock.database.repository import FileRepository, FolderRepository, UserRepository
 from skylock.database import models as db_models
 from skylock.utils.exceptions import ResourceNotFoundException
@@ -24,11 +29,15 @@ class PathResolver:
         self._folder_repository = folder_repository
         self._user_repository = user_repository
 
-    def folder_from_path(self, user_path: UserPath) -> db_models.FolderEntity:
+    def folder_from_path(
+        self, user_path: UserPath, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FolderEntity:
         """Retrieves a folder entity from a given user path.
 
         Args:
             user_path (UserPath): The user-specific path to the folder.
+            options (Sequence[ExecutableOption]): Loader options applied to the query
+                for the resolved folder only.
 
         Returns:
             db_models.FolderEntity: The resolved folder entity.
@@ -37,25 +46,72 @@ class PathResolver:
             LookupError: If the root folder specified in the path does not exist.
             ResourceNotFoundException: If any part of the path does not resolve to a folder.
         """
-        current_folder = self._get_root_folder(user_path.root_folder_name)
+        parts = user_path.parts
+        current_folder = self._get_root_folder(
+            user_path.root_folder_name, options=() if parts else options
+        )
 
         if current_folder is None:
             raise LookupError(f"Root folder: {user_path.root_folder_name} does not exist")
 
-        for folder_name in user_path.parts:
+        last_index = len(parts) - 1
+        for index, folder_name in enumerate(parts):
             current_folder = self._folder_repository.get_by_name_and_parent_id(
-                folder_name, current_folder.id
+                folder_name, current_folder.id, options=options if index == last_index else ()
             )
             if current_folder is None:
                 raise ResourceNotFoundException(missing_resource_name=folder_name)
 
         return current_folder
 
-    def file_from_path(self, user_path: UserPath) -> db_models.FileEntity:
+    def existing_prefix(self, user_path: UserPath) -> tuple[db_models.FolderEntity, int]:
+        """Resolves the deepest folder on a path that already exists.
+
+        Unlike `folder_from_path`, the whole chain of ancestors is resolved with a
+        single query and a missing folder is not an error.
+
+        Args:
+            user_path (UserPath): The user-specific path to resolve.
+
+        Returns:
+            tuple[db_models.FolderEntity, int]: The deepest existing folder and the number
+                of path parts it covers.
+
+        Raises:
+            LookupError: If the root folder specified in the path does not exist.
+        """
+        result = self._folder_repository.get_deepest_on_path(
+            user_path.root_folder_name, user_path.parts
+        )
+
+        if result is None:
+            raise LookupError(f"Root folder: {user_path.root_folder_name} does not exist")
+
+        return result
+
+    def find_folder(self, user_path: UserPath) -> Optional[db_models.FolderEntity]:
+        """Retrieves a folder entity from a given user path, if it exists.
+
+        Args:
+            user_path (UserPath): The user-specific path to the folder.
+
+        Returns:
+            Optional[db_models.FolderEntity]: The folder entity if found, otherwise None.
+
+        Raises:
+            LookupError: If the root folder specified in the path does not exist.
+        """
+        folder, depth = self.existing_prefix(user_path)
+        return folder if depth == len(user_path.parts) else None
+
+    def file_from_path(
+        self, user_path: UserPath, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FileEntity:
         """Retrieves a file entity from a given user path.
 
         Args:
             user_path (UserPath): The user-specific path to the file.
+            options (Sequence[ExecutableOption]): Loader options for the file query.
 
         Returns:
             db_models.FileEntity: The resolved file entity.
@@ -65,7 +121,7 @@ class PathResolver:
         """
         parent_folder = self.folder_from_path(user_path.parent)
         file = self._file_repository.get_by_name_and_parent(
-            name=user_path.name, parent=parent_folder
+            name=user_path.name, parent=parent_folder, options=options
         )
 
         if file is None:
@@ -73,6 +129,48 @@ class PathResolver:
 
         return file
 
+    def find_any(self, user_path: UserPath) -> Optional[tuple[ResourceType, str]]:
+        """Determines what resource a path points to, if any.
+
+        Args:
+            user_path (UserPath): The user-specific path to the resource.
+
+        Returns:
+            Optional[tuple[ResourceType, str]]: The type and the ID of the resource, or None
+                if the path does not resolve to any resource.
+
+        Raises:
+            LookupError: If the root folder specified in the path does not exist.
+        """
+        if user_path.is_root_folder():
+            return ResourceType.FOLDER, self.folder_from_path(user_path).id
+
+        parent_folder = self.find_folder(user_path.parent)
+        if parent_folder is None:
+            return None
+
+        return self._folder_repository.find_child(parent_folder.id, user_path.name)
+
+    def resolve_any(self, user_path: UserPath) -> tuple[ResourceType, str]:
+        """Determines what resource a path points to, without trying each type in turn.
+
+        Args:
+            user_path (UserPath): The user-specific path to the resource.
+
+        Returns:
+            tuple[ResourceType, str]: The type and the ID of the resource.
+
+        Raises:
+            LookupError: If the root folder specified in the path does not exist.
+            ResourceNotFoundException: If the path does not resolve to any resource.
+        """
+        resource = self.find_any(user_path)
+
+        if resource is None:
+            raise ResourceNotFoundException(missing_resource_name=user_path.name)
+
+        return resource
+
     def path_from_folder(self, folder: db_models.FolderEntity) -> UserPath:
         """Constructs a UserPath object from a folder entity.
 
@@ -125,15 +223,20 @@ class PathResolver:
         parent_path = self.path_from_folder(parent_folder)
         return parent_path / link.name
 
-    def _get_root_folder(self, name: str) -> db_models.FolderEntity | None:
+    def _get_root_folder(
+        self, name: str, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FolderEntity | None:
         """Retrieves a root folder by its name.
 
         A root folder is identified by having no parent.
 
         Args:
             name (str): The name of the root folder (typically user's ID).
+            options (Sequence[ExecutableOption]): Loader options for the query.
 
         Returns:
             db_models.FolderEntity | None: The root folder entity if found, else None.
         """
-        return self._folder_repository.get_by_name_and_parent_id(name=name, parent_id=None)
+        return self._folder_repository.get_by_name_and_parent_id(
+            name=name, parent_id=None, options=options
+        )
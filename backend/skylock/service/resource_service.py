@@ -1,8 +1,10 @@
-from typing import IO, Optional
+from typing import IO, Iterable, Optional, Sequence
 from fastapi import HTTPException
+from sqlalchemy.sql.base import ExecutableOption
 
 from skylock.database import models as db_models
 from skylock.database.repository import (
+    FOLDER_LINKS,
     FileRepository,
     FolderRepository,
     UserRepository,
@@ -19,15 +21,18 @@ from skylock.utils.exceptions import (
     UserNotFoundException,
 )
 from skylock.utils.path import UserPath
-from skylock.utils.storage import FileStorageService
+from skylock.utils.storage import FileStorageService, stream_size
 
 from skylock.api.models import Privacy, FolderType, ResourceType
-from skylock.utils.security import get_user_from_jwt
+from skylock.utils.security import get_user_from_jwt, strip_bearer_prefix
 
 from skylock.utils.logger import logger
 
+SPECIAL_FOLDER_TYPES = (FolderType.SHARED, FolderType.SHARING_USER)
 
-class ResourceService:
+
+# besides its seven collaborators, the service keeps the request-scoped token memo
+class ResourceService:  # pylint: disable=too-many-instance-attributes
     """Manages user resources like files, folders, and links."""
 
     def __init__(
@@ -58,23 +63,52 @@ class ResourceService:
         self._user_repository = user_repository
         self._shared_file_repository = shared_file_repository
         self._link_repository = link_repository
+        self._token_users: dict[str, db_models.UserEntity] = {}
+
+    def _uow(self):
+        """Opens a unit of work so that a service call commits exactly once."""
+        return self._folder_repository.unit_of_work()
 
-    def get_folder(self, user_path: UserPath) -> db_models.FolderEntity:
+    def get_folder(
+        self, user_path: UserPath, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FolderEntity:
         """Retrieves a folder entity based on its user path.
 
         Args:
             user_path: The path to the folder.
+            options: Loader options for the collections the caller consumes.
 
         Returns:
             The folder entity.
         """
-        return self._path_resolver.folder_from_path(user_path)
+        return self._path_resolver.folder_from_path(user_path, options=options)
 
-    def get_folder_by_id(self, folder_id: str) -> db_models.FolderEntity:
+    def get_folder_tree(self, user_path: UserPath) -> db_models.FolderEntity:
+        """Retrieves a folder with its whole subtree of folders, files and links loaded.
+
+        Args:
+            user_path: The path to the folder.
+
+        Returns:
+            The folder entity.
+
+        Raises:
+            ResourceNotFoundException: If the folder is not found.
+        """
+        folder = self._path_resolver.folder_from_path(user_path)
+        subtree = self._folder_repository.get_subtree(folder.id)
+        if subtree is None:
+            raise ResourceNotFoundException(missing_resource_name=user_path.path)
+        return subtree
+
+    def get_folder_by_id(
+        self, folder_id: str, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FolderEntity:
         """Retrieves a folder entity by its ID.
 
         Args:
             folder_id: The ID of the folder.
+            options: Loader options for the collections the caller consumes.
 
         Returns:
             The folder entity.
@@ -82,18 +116,21 @@ class ResourceService:
         Raises:
             ResourceNotFoundException: If the folder is not found.
         """
-        current_folder = self._folder_repository.get_by_id(folder_id)
+        current_folder = self._folder_repository.get_by_id(folder_id, options=options)
 
         if current_folder is None:
             raise ResourceNotFoundException(missing_resource_name=folder_id)
 
         return current_folder
 
-    def get_public_folder(self, folder_id: str) -> db_models.FolderEntity:
+    def get_public_folder(
+        self, folder_id: str, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FolderEntity:
         """Retrieves a folder by ID, ensuring it is public.
 
         Args:
             folder_id: The ID of the folder.
+            options: Loader options for the collections the caller consumes.
 
         Returns:
             The public folder entity.
@@ -102,9 +139,9 @@ class ResourceService:
             ResourceNotFoundException: If the folder is not found.
             ForbiddenActionException: If the folder is not public.
         """
-        folder = self.get_folder_by_id(folder_id)
+        folder = self.get_folder_by_id(folder_id, options=options)
 
-        if not folder.privacy == Privacy.PUBLIC:
+        if folder.privacy != Privacy.PUBLIC:
             raise ForbiddenActionException(f"Folder with id {folder_id} is not public")
 
         return folder
@@ -160,33 +197,21 @@ class ResourceService:
         Returns:
             The updated folder entity.
         """
-        folder = self._path_resolver.folder_from_path(user_path)
-        self._update_folder(folder, privacy, recursive)
+        with self._uow():
+            folder = self._path_resolver.folder_from_path(user_path)
+            if folder.type in SPECIAL_FOLDER_TYPES:
+                return folder
+
+            folder_ids = [folder.id]
+            if recursive:
+                # special folders and everything below them keep their privacy
+                folder_ids += self._folder_repository.collect_descendant_ids(
+                    folder.id, skip_types=SPECIAL_FOLDER_TYPES
+                )
+            self._folder_repository.bulk_set_privacy(folder_ids, privacy)
+            self._file_repository.bulk_set_privacy_by_folder_ids(folder_ids, privacy)
         return folder
 
-    def _update_folder(
-        self, folder: db_models.FolderEntity, privacy: Privacy, recursive: bool
-    ) -> None:
-        """Helper to update folder privacy recursively."""
-        if folder.type == FolderType.SHARED or folder.type == FolderType.SHARING_USER:
-            return
-
-        folder.privacy = privacy
-
-        for file in folder.files:
-            self._update_file(file, privacy)
-
-        if recursive:
-            for subfolder in folder.subfolders:
-                self._update_folder(subfolder, privacy, recursive)
-
-        self._folder_repository.save(folder)
-
-    def _update_file(self, file: db_models.FileEntity, privacy: Privacy) -> None:
-        """Helper to update file privacy."""
-        file.privacy = privacy
-        self._file_repository.save(file)
-
     def create_folder_with_parents(
         self, user_path: UserPath, privacy: Privacy = Privacy.PRIVATE
     ) -> db_models.FolderEntity:
@@ -198,23 +223,33 @@ class ResourceService:
 
         Returns:
             The target created folder entity.
+
+        Raises:
+            ForbiddenActionException: If attempting to create a root folder.
+            ResourceAlreadyExistsException: If the folder or a conflicting resource exists.
         """
         if user_path.is_root_folder():
             raise ForbiddenActionException("Creation of root folder is forbidden")
 
-        for parent_user_path in reversed(user_path.parents):
-            if not parent_user_path.is_root_folder() and not self._folder_exists(parent_user_path):
-                self.create_folder(parent_user_path, privacy=privacy)
-
-        return self.create_folder(user_path, privacy)
-
-    def _folder_exists(self, user_path: UserPath) -> bool:
-        """Checks if a folder exists at the given path."""
-        try:
-            self._path_resolver.folder_from_path(user_path)
-            return True
-        except ResourceNotFoundException:
-            return False
+        with self._uow():
+            folder, depth = self._path_resolver.existing_prefix(user_path)
+            missing_names = user_path.parts[depth:]
+            if not missing_names:
+                raise ResourceAlreadyExistsException(
+                    f"A resource named '{user_path.name}' already exists in this folder."
+                )
+            # folders below the first missing one are new, so only it can clash
+            self._assert_no_children_matching_name(folder, missing_names[0])
+
+            for name in missing_names:
+                folder = db_models.FolderEntity(
+                    name=name,
+                    parent_folder=folder,
+                    owner=user_path.owner,
+                    privacy=privacy,
+                    type=FolderType.NORMAL,
+                )
+            return self._folder_repository.save(folder)
 
     def delete_folder(self, user_path: UserPath, is_recursively: bool = False):
         """Deletes a folder.
@@ -227,11 +262,19 @@ class ResourceService:
             ForbiddenActionException: If trying to delete a root or special folder.
             FolderNotEmptyException: If folder is not empty and not recursive.
         """
-        folder = self._path_resolver.folder_from_path(user_path)
-        self._delete_folder(folder, is_recursively=is_recursively)
+        with self._uow():
+            folder = self._path_resolver.folder_from_path(user_path)
+            deleted_file_ids = self._delete_folder(folder, is_recursively=is_recursively)
+        self._delete_files_data(deleted_file_ids)
 
-    def _delete_folder(self, folder: db_models.FolderEntity, is_recursively: bool = False):
-        """Helper to delete folder and its contents."""
+    def _delete_folder(
+        self, folder: db_models.FolderEntity, is_recursively: bool = False
+    ) -> list[str]:
+        """Helper to delete folder, leaving its subtree to ON DELETE CASCADE.
+
+        Returns:
+            The IDs of the deleted files, whose stored data still has to be removed.
+        """
         if folder.is_root():
             raise ForbiddenActionException("Deletion of root folder is forbidden")
 
@@ -239,39 +282,37 @@ class ResourceService:
             logger.warning("Attempted to delete a special folder: %s", folder.name)
             raise ForbiddenActionException("You cannot delete special folders")
 
-        has_folder_children = bool(folder.subfolders or folder.files or folder.links)
-        if not is_recursively and has_folder_children:
+        if not is_recursively and self._folder_repository.has_children(folder.id):
             raise FolderNotEmptyException()
 
-        for file in folder.files:
-            self._delete_file(file)
-
-        for subfolder in folder.subfolders:
-            self._delete_folder(subfolder, is_recursively=True)
-
         if folder.type == FolderType.SHARING_USER:
-            for link in folder.links:
-                if link.target_file_id:  # safe check
-                    self._shared_file_repository.delete_shared_files_from_users(
-                        link.target_file_id, folder.owner.id
-                    )
-                self._link_repository.delete(link)
-        else:
-            for link in folder.links:
-                self._link_repository.delete(link)
+            self._shared_file_repository.delete_many(
+                self._link_repository.get_target_file_ids([folder.id]), folder.owner_id
+            )
 
-        self._folder_repository.delete(folder)
+        # stored file data is not covered by the cascade, so its ids are collected first
+        folder_ids = [folder.id, *self._folder_repository.collect_descendant_ids(folder.id)]
+        file_ids = self._file_repository.get_ids_by_folder_ids(folder_ids)
+        # the cascade also drops other users' links to these files, emptying their sharing folders
+        link_folder_ids = self._link_repository.get_folder_ids_by_target_file_ids(file_ids)
 
-    def get_file(self, user_path: UserPath) -> db_models.FileEntity:
+        self._folder_repository.delete_by_id(folder.id)
+        self._folder_repository.delete_empty(link_folder_ids, FolderType.SHARING_USER)
+        return file_ids
+
+    def get_file(
+        self, user_path: UserPath, options: Sequence[ExecutableOption] = ()
+    ) -> db_models.FileEntity:
         """Retrieves a file entity based on its user path.
 
         Args:
             user_path: The path to the file.
+            options: Loader options for the collections the caller consumes.
 
         Returns:
             The file entity.
         """
-        return self._path_resolver.file_from_path(user_path)
+        return self._path_resolver.file_from_path(user_path, options=options)
 
     def get_file_by_id(self, file_id: str) -> db_models.FileEntity:
         """Retrieves a file entity by its ID.
@@ -292,6 +333,18 @@ class ResourceService:
 
         return file
 
+    def is_file_shared_with(self, file_id: str, user_id: str) -> bool:
+        """Checks if a file is shared with a user without loading its sharing list.
+
+        Args:
+            file_id: The ID of the file.
+            user_id: The ID of the user.
+
+        Returns:
+            True if the file is shared with the user, False otherwise.
+        """
+        return self._file_repository.is_shared_with(file_id, user_id)
+
     def get_verified_file(self, file_id: str, token: Optional[str]) -> db_models.FileEntity:
         """Retrieves a file by ID, performing access verification.
 
@@ -315,35 +368,40 @@ class ResourceService:
         if token is None:
             raise ForbiddenActionException("Authentication token is required for this resource.")
 
-        processed_token = token.replace("Bearer ", "")
+        user = self._user_from_token(token)
 
-        try:
-            user = get_user_from_jwt(processed_token, self._user_repository)
-        except HTTPException as exc:
-            raise ForbiddenActionException("Invalid token") from exc
+        if user.id == file.owner_id:
+            return file
 
-        if (
-            privacy == Privacy.PROTECTED
-            and user.username not in file.shared_to
-            and user.id != file.owner_id
-        ):
-            raise ForbiddenActionException("file is not shared with you")
+        if privacy == Privacy.PROTECTED and self._file_repository.is_shared_with(file.id, user.id):
+            return file
 
-        if privacy == Privacy.PRIVATE and user.id != file.owner_id:
-            raise ForbiddenActionException("file is not shared with you")
+        raise ForbiddenActionException("file is not shared with you")
 
-        return file
+    def _user_from_token(self, token: str) -> db_models.UserEntity:
+        """Resolves the user a bearer token belongs to.
+
+        Results are memoized on the service, which lives for a single request, so a request
+        verifying many files decodes the token and loads its user only once.
+
+        Raises:
+            ForbiddenActionException: If the token is invalid.
+        """
+        processed_token = strip_bearer_prefix(token)
+        user = self._token_users.get(processed_token)
+        if user is None:
+            try:
+                user = get_user_from_jwt(processed_token, self._user_repository)
+            except HTTPException as exc:
+                raise ForbiddenActionException("Invalid token") from exc
+            self._token_users[processed_token] = user
+        return user
 
     def get_file_by_token_path(self, path: str, token=None) -> db_models.FileEntity:
         if token is None:
             raise ForbiddenActionException("Authentication token is required for this resource.")
 
-        processed_token = token.replace("Bearer ", "")
-
-        try:
-            user = get_user_from_jwt(processed_token, self._user_repository)
-        except HTTPException as exc:
-            raise ForbiddenActionException("Invalid token") from exc
+        user = self._user_from_token(token)
 
         user_path = UserPath(path, user)
         resource_type = self.check_resource_type(user_path)
@@ -366,17 +424,17 @@ class ResourceService:
     def create_file(
         self,
         user_path: UserPath,
-        data: bytes,
-        size: int,
+        data: IO[bytes],
         force: bool = False,
         privacy: Privacy = Privacy.PRIVATE,
     ) -> db_models.FileEntity:
         """Creates a new file with the given data.
 
+        The content is streamed to storage in chunks; its size is taken from the stream.
+
         Args:
             user_path: The path where the file will be created.
-            data: The binary content of the file.
-            size: The size of the file in bytes.
+            data: A seekable binary stream with the content of the file.
             force: If True, overwrites an existing file.
             privacy: The privacy setting for the new file.
 
@@ -392,25 +450,38 @@ class ResourceService:
 
         file_name = user_path.name
         parent_path = user_path.parent
-        parent = self._path_resolver.folder_from_path(parent_path)
-        if parent.type != FolderType.NORMAL:
-            raise ForbiddenActionException("You cannot create file in special folders")
-
-        if force:
-            try:
-                self.delete_file(user_path)
-            except ResourceNotFoundException:
-                pass
+        replaced_file_ids: list[str] = []
+        with self._uow():
+            parent = self._path_resolver.folder_from_path(parent_path)
+            if parent.type != FolderType.NORMAL:
+                raise ForbiddenActionException("You cannot create file in special folders")
+
+            if force:
+                existing = self._folder_repository.find_child(parent.id, file_name)
+                if existing is not None and existing[0] == ResourceType.FILE:
+                    replaced_file_ids = self._delete_file_and_links(
+                        self.get_file_by_id(existing[1])
+                    )
 
-        self._assert_no_children_matching_name(parent, file_name)
+            self._assert_no_children_matching_name(parent, file_name)
 
-        new_file = self._file_repository.save(
-            db_models.FileEntity(
-                name=file_name, folder=parent, owner=user_path.owner, privacy=privacy, size=size
+            new_file = self._file_repository.save(
+                db_models.FileEntity(
+                    name=file_name,
+                    folder=parent,
+                    owner=user_path.owner,
+                    privacy=privacy,
+                    size=stream_size(data),
+                )
             )
-        )
+        self._delete_files_data(replaced_file_ids)
 
-        self._save_file_data(file=new_file, data=data)
+        try:
+            self._save_file_data(file=new_file, data=data)
+        except Exception:
+            # the row is already committed; drop it so no entry points at missing data
+            self._file_repository.delete(new_file)
+            raise
 
         return new_file
 
@@ -427,10 +498,32 @@ class ResourceService:
         Returns:
             The updated file entity.
         """
-        file = self._path_resolver.file_from_path(user_path)
-        file.privacy = privacy
-        file.shared_to = shared_to
-        return self._file_repository.save(file)
+        with self._uow():
+            file = self._path_resolver.file_from_path(user_path)
+            file.privacy = privacy
+            self._file_repository.set_shared_users(file.id, shared_to)
+        # the unit of work flushed the privacy change with its single commit
+        return file
+
+    def unshare_file(self, file_id: str, user_ids: Iterable[str]):
+        """Revokes the access of users to a shared file.
+
+        The users' links to the file, their shared file entries and the sharing
+        folders left empty are removed with one statement each.
+
+        Args:
+            file_id: The ID of the shared file.
+            user_ids: The IDs of the users who lose access to the file.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        with self._uow():
+            link_folder_ids = self._link_repository.delete_by_file_id_and_owner_ids(
+                file_id, user_ids
+            )
+            self._folder_repository.delete_empty(link_folder_ids, FolderType.SHARING_USER)
+            self._shared_file_repository.delete_by_file_id_and_user_ids(file_id, user_ids)
 
     def delete_file(self, user_path: UserPath):
         """Deletes a file and all links pointing to it.
@@ -438,12 +531,46 @@ class ResourceService:
         Args:
             user_path: The path to the file to delete.
         """
-        file = self.get_file(user_path)
-        links = self._link_repository.get_by_file_id(file.id)
-        for link in links:
-            link_path = self._path_resolver.path_from_link(link)
-            self.delete_link(link_path)
-        self._delete_file(file)
+        with self._uow():
+            deleted_file_ids = self._delete_file_and_links(self.get_file(user_path))
+        self._delete_files_data(deleted_file_ids)
+
+    def delete_file_or_link(self, user_path: UserPath):
+        """Deletes the file or the link at a path, resolving the path only once.
+
+        Args:
+            user_path: The path to the file or link to delete.
+
+        Raises:
+            ResourceNotFoundException: If no resource is found at the path.
+            ForbiddenActionException: If the resource at the path is a folder.
+        """
+        resource_type, resource_id = self._path_resolver.resolve_any(user_path)
+        if resource_type == ResourceType.FOLDER:
+            raise ForbiddenActionException(
+                f"Resource at {user_path.path} is not a deletable file or link type."
+            )
+
+        deleted_file_ids: list[str] = []
+        with self._uow():
+            if resource_type == ResourceType.FILE:
+                deleted_file_ids = self._delete_file_and_links(self.get_file_by_id(resource_id))
+            else:
+                link = self._link_repository.get_by_id(resource_id)
+                if link is None:
+                    raise ResourceNotFoundException(missing_resource_name=user_path.name)
+                self._delete_link(link)
+        self._delete_files_data(deleted_file_ids)
+
+    def _delete_file_and_links(self, file: db_models.FileEntity) -> list[str]:
+        """Helper to delete a file, the links to it and the sharing folders they leave empty.
+
+        Returns:
+            The IDs of the deleted files, whose stored data still has to be removed.
+        """
+        link_folder_ids = self._link_repository.delete_by_file_id(file.id)
+        self._folder_repository.delete_empty(link_folder_ids, FolderType.SHARING_USER)
+        return self._delete_file(file)
 
     def check_resource_type(self, user_path: UserPath) -> ResourceType:
         """Determines the type (file, folder, or link) of a resource at a path.
@@ -457,30 +584,20 @@ class ResourceService:
         Raises:
             ResourceNotFoundException: If no resource is found at the path.
         """
-        try:
-            self.get_file(user_path)
-            return ResourceType.FILE
-        except ResourceNotFoundException:
-            pass
+        resource_type, _ = self._path_resolver.resolve_any(user_path)
+        return resource_type
 
-        try:
-            self.get_link(user_path)
-            return ResourceType.LINK
-        except ResourceNotFoundException:
-            pass
-
-        try:
-            self.get_folder(user_path)
-            return ResourceType.FOLDER
-        except ResourceNotFoundException:
-            pass
+    def _delete_file(self, file: db_models.FileEntity) -> list[str]:
+        """Helper to delete a file entity, leaving its stored data to the caller.
 
-        raise ResourceNotFoundException(missing_resource_name=f"Resource {user_path} not found")
+        The data is removed only once the unit of work has committed, so a rollback
+        never leaves a restored row pointing at missing data.
 
-    def _delete_file(self, file: db_models.FileEntity):
-        """Helper to delete file entity and its stored data."""
+        Returns:
+            The IDs of the deleted files.
+        """
         self._file_repository.delete(file)
-        self._delete_file_data(file)
+        return [file.id]
 
     def get_file_data(self, user_path: UserPath) -> IO[bytes]:
         """Retrieves the binary data of a file by its path.
@@ -521,7 +638,10 @@ class ResourceService:
             UserNotFoundException: If the importing user is not found.
         """
         file = self.get_file_by_id(file_id)
-        if file.owner_id != user_id:
+        if file.owner_id == user_id:
+            return
+
+        with self._uow():
             if not self._shared_file_repository.is_file_shared_to_user(file_id, user_id):
                 self.add_to_shared_files(user_id, file_id)
             user = self._user_repository.get_by_id(user_id)
@@ -531,9 +651,7 @@ class ResourceService:
             importing_user_folder_path = (
                 UserPath.root_folder_of(user) / "Shared" / file.owner.username
             )
-            try:
-                self.get_folder(importing_user_folder_path)
-            except ResourceNotFoundException:
+            if self._path_resolver.find_folder(importing_user_folder_path) is None:
                 self.create_folder(
                     importing_user_folder_path, Privacy.PRIVATE, FolderType.SHARING_USER
                 )
@@ -568,25 +686,21 @@ class ResourceService:
         Raises:
             ResourceAlreadyExistsException: If a link to this file by this owner already exists.
         """
-        if self._link_repository.get_by_file_id_and_owner_id(
-            file_id=file.id, owner_id=user_path.owner.id
-        ):
+        parent = self._path_resolver.folder_from_path(user_path.parent)
+
+        new_link = self._link_repository.insert_unique(
+            name=user_path.name,
+            folder_id=parent.id,
+            owner_id=user_path.owner.id,
+            resource_type=ResourceType.FILE.value,
+            target_file_id=file.id,
+        )
+        if new_link is None:
             logger.info(f"Link to file {file.name} already exists in {user_path}")
             raise ResourceAlreadyExistsException(
                 f"Link to file {file.name} already exists in {user_path}"
             )
-        link_name = user_path.name
-        parent_path = user_path.parent
-        parent = self._path_resolver.folder_from_path(parent_path)
-
-        new_link = db_models.LinkEntity(
-            name=link_name,
-            folder=parent,
-            owner=user_path.owner,
-            resource_type=ResourceType.FILE.value,
-            target_file=file,
-        )
-        return self._link_repository.save(new_link)
+        return new_link
 
     def get_link(self, user_path: UserPath) -> db_models.LinkEntity:
         """Retrieves a link entity by its path.
@@ -616,20 +730,25 @@ class ResourceService:
         Args:
             user_path: The path to the link to delete.
         """
-        link = self.get_link(user_path)
-        folder = self.get_folder(user_path.parent)
+        with self._uow():
+            self._delete_link(self.get_link(user_path))
+
+    def _delete_link(self, link: db_models.LinkEntity):
+        """Helper to delete a link, and its SHARING_USER folder if it was the last link there."""
+        folder = self.get_folder_by_id(link.folder_id, options=FOLDER_LINKS)
         if folder.type == FolderType.SHARING_USER:
+            is_last_link = all(other is link for other in folder.links)
             if link.target_file_id:
                 self._shared_file_repository.delete_shared_files_from_users(
-                    link.target_file_id, user_path.owner.id
+                    link.target_file_id, link.owner_id
                 )
             self._link_repository.delete(link)
-            if len(folder.links) == 0:
+            if is_last_link:
                 self._folder_repository.delete(folder)
         else:
             self._link_repository.delete(link)
 
-    def _save_file_data(self, file: db_models.FileEntity, data: bytes):
+    def _save_file_data(self, file: db_models.FileEntity, data: IO[bytes]):
         """Saves file content to the storage service."""
         self._file_storage_service.save_file(data=data, file=file)
 
@@ -637,9 +756,9 @@ class ResourceService:
         """Retrieves file content from the storage service."""
         return self._file_storage_service.get_file(file=file)
 
-    def _delete_file_data(self, file: db_models.FileEntity):
-        """Deletes file content from the storage service."""
-        return self._file_storage_service.delete_file(file)
+    def _delete_files_data(self, file_ids: list[str]):
+        """Deletes the content of many files from the storage service."""
+        self._file_storage_service.delete_files(file_ids)
 
     def create_root_folder(self, user_path: UserPath):
         """Creates a root folder for a user.
@@ -673,22 +792,34 @@ class ResourceService:
         Raises:
             ResourceAlreadyExistsException: If a child with the same name exists.
         """
-        exists_file_of_name = name in [file.name for file in folder.files]
-        exists_folder_of_name = name in [subfolder.name for subfolder in folder.subfolders]
-        if exists_file_of_name or exists_folder_of_name:
+        if self._folder_repository.child_name_exists(folder.id, name):
             raise ResourceAlreadyExistsException(
                 f"A resource named '{name}' already exists in this folder."
             )
 
-    def zip_exists(self, user_path: UserPath, force: bool) -> bool:
-        """Checks if a folder exists at the given path."""
-        zip_path = user_path.path + ".zip"
-        user_zip_path = UserPath(path=zip_path, owner=user_path.owner)
+    def prepare_zip(self, user_path: UserPath, force: bool) -> db_models.FolderEntity:
+        """Resolves a folder to be zipped and checks that its archive may be created.
 
-        if force:
-            return False
-        try:
-            self._path_resolver.file_from_path(user_zip_path)
-            raise ResourceAlreadyExistsException(f"file {user_zip_path.name} already exists")
-        except ResourceNotFoundException:
-            return False
+        The archive is saved next to the folder as "<name>.zip", so the existence check
+        looks in the folder's parent by ID instead of resolving the archive path again.
+        The root folder has no parent; its archive is saved inside it as ".zip".
+
+        Args:
+            user_path: The path to the folder.
+            force: If True, an existing archive file will be overwritten.
+
+        Returns:
+            The folder entity.
+
+        Raises:
+            ResourceNotFoundException: If the folder does not exist.
+            ResourceAlreadyExistsException: If the archive file exists and force is not set.
+        """
+        folder = self._path_resolver.folder_from_path(user_path)
+        if folder.parent_folder_id is None:
+            zip_name, zip_folder_id = ".zip", folder.id
+        else:
+            zip_name, zip_folder_id = folder.name + ".zip", folder.parent_folder_id
+        if not force and self._file_repository.name_exists_in_folder(zip_folder_id, zip_name):
+            raise ResourceAlreadyExistsException(f"file {zip_name} already exists")
+        return folder
@@ -1,11 +1,20 @@
-from typing import IO
+from typing import IO, Iterator
 from skylock.api import models
 from skylock.database import models as db_models
 from skylock.utils.path import UserPath
 
+# Entities hold the raw column values; mapping them through a dict is cheaper
+# than calling the enum class for every listed child.
+PRIVACY_BY_VALUE = {privacy.value: privacy for privacy in models.Privacy}
+FOLDER_TYPE_BY_VALUE = {folder_type.value: folder_type for folder_type in models.FolderType}
+
 
 class ResponseBuilder:
-    """Builds API response models from database entities."""
+    """Builds API response models from database entities.
+
+    The entities come from the database and already hold valid values, so the
+    models are created with `model_construct`, which skips Pydantic validation.
+    """
 
     def get_folder_contents_response(
         self, folder: db_models.FolderEntity, user_path: UserPath
@@ -19,39 +28,40 @@ class ResponseBuilder:
         Returns:
             A FolderContents model detailing the folder and its children.
         """
-        parent_path = f"/{user_path.path}" if user_path.path else ""
+        folder_path = user_path.abs_path
+        child_prefix = f"{folder_path}/" if user_path.path else "/"
         children_files = [
-            models.File(
+            models.File.model_construct(
                 id=file.id,
                 name=file.name,
-                privacy=models.Privacy(file.privacy),
+                privacy=PRIVACY_BY_VALUE[file.privacy],
                 size=file.size,
-                path=f"{parent_path}/{file.name}",
+                path=child_prefix + file.name,
                 owner_id=file.owner_id,
             )
             for file in folder.files
         ]
         children_folders = [
-            models.Folder(
+            models.Folder.model_construct(
                 id=subfolder.id,
                 name=subfolder.name,
-                privacy=models.Privacy(subfolder.privacy),
-                path=f"{parent_path}/{subfolder.name}",
-                type=models.FolderType(subfolder.type),
+                privacy=PRIVACY_BY_VALUE[subfolder.privacy],
+                path=child_prefix + subfolder.name,
+                type=FOLDER_TYPE_BY_VALUE[subfolder.type],
             )
             for subfolder in folder.subfolders
         ]
         children_links = [
-            models.Link(
+            models.Link.model_construct(
                 id=link.id,
                 name=link.name,
-                path=f"{parent_path}/{link.name}",
+                path=child_prefix + link.name,
             )
             for link in folder.links
         ]
-        return models.FolderContents(
+        return models.FolderContents.model_construct(
             folder_name=folder.name,
-            folder_path=f"/{user_path.path}" if user_path.path else "/",
+            folder_path=folder_path,
             files=children_files,
             folders=children_folders,
             links=children_links,
@@ -69,12 +79,12 @@ class ResponseBuilder:
         Returns:
             A Folder model representing the folder's metadata.
         """
-        return models.Folder(
+        return models.Folder.model_construct(
             id=folder.id,
             name=folder.name,
-            path=f"/{user_path.path}" if user_path.path else "/",
-            privacy=models.Privacy(folder.privacy),
-            type=models.FolderType(folder.type),
+            path=user_path.abs_path,
+            privacy=PRIVACY_BY_VALUE[folder.privacy],
+            type=FOLDER_TYPE_BY_VALUE[folder.type],
         )
 
     def get_file_response(self, file: db_models.FileEntity, user_path: UserPath) -> models.File:
@@ -87,14 +97,14 @@ class ResponseBuilder:
         Returns:
             A File model representing the file's metadata.
         """
-        return models.File(
+        return models.File.model_construct(
             id=file.id,
             name=file.name,
-            path=f"/{user_path.path}" if user_path.path else f"/{file.name}",
+            path=user_path.abs_path if user_path.path else f"/{file.name}",
             size=file.size,
-            privacy=models.Privacy(file.privacy),
+            privacy=PRIVACY_BY_VALUE[file.privacy],
             owner_id=file.owner_id,
-            shared_to=file.shared_to,
+            shared_to=sorted(file.shared_to),
         )
 
     def get_file_data_response(
@@ -112,13 +122,13 @@ class ResponseBuilder:
         return models.FileData(name=file.name, data=file_data)
 
     def get_folder_data_response(
-        self, folder: db_models.FolderEntity, folder_data: IO[bytes]
+        self, folder: db_models.FolderEntity, folder_data: Iterator[bytes]
     ) -> models.FolderData:
         """Builds a response model for folder data (e.g., ZIP download).
 
         Args:
             folder: The database folder entity (for metadata).
-            folder_data: An I/O stream of the folder's (zipped) binary content.
+            folder_data: An iterator over chunks of the folder's (zipped) binary content.
 
         Returns:
             A FolderData model containing the folder name (as .zip) and data stream.
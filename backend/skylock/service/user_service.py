@@ -16,6 +16,12 @@ from skylock.utils.logger import logger as s_logger
 from skylock.utils.reddis_mem import redis_mem as s_redis_mem
 from templates.mails import two_fa_code_mail
 
+# PasswordHasher keeps no per-call state, so one instance serves every service
+PASSWORD_HASHER = argon2.PasswordHasher()
+# Verified against when the username is unknown, so that a failed login takes
+# the same time whether or not the user exists.
+DUMMY_PASSWORD_HASH = PASSWORD_HASHER.hash("")
+
 
 class UserService:
     """Manages user-related operations like registration, login, and 2FA."""
@@ -29,7 +35,7 @@ class UserService:
             logger: Optional logger instance.
         """
         self.user_repository = user_repository
-        self.password_hasher = argon2.PasswordHasher()
+        self.password_hasher = PASSWORD_HASHER
 
         self.logger = logger or s_logger
         self.redis_mem = redis_mem or s_redis_mem
@@ -49,19 +55,16 @@ class UserService:
             UserAlreadyExists: If the username or email is already in use.
             Exception: If sending the email fails.
         """
-        existing_user_entity = self.user_repository.get_by_username(username)
-        existing_mail_entity = self.user_repository.get_by_email(email)
-
-        if existing_user_entity or existing_mail_entity:
+        if self.user_repository.is_username_or_email_taken(username, email):
             raise UserAlreadyExists()
         user_secret = pyotp.random_base32()
 
         self.redis_mem.setex(f"2fa:{username}", self.token_life + 5, user_secret)
 
-        totp = pyotp.TOTP(user_secret, interval=self.token_life)
+        code = pyotp.TOTP(user_secret, interval=self.token_life).now()
 
         subject = "Complete you registration to Skylock!"
-        body = two_fa_code_mail(username, totp.now(), self.token_life)
+        body = two_fa_code_mail(username, code, self.token_life)
 
         try:
             send_mail(email, subject, body)
@@ -69,7 +72,7 @@ class UserService:
             raise e
 
         if ENV_TYPE == "dev":
-            self.logger.info(f"TOTP for user: {totp.now()}")
+            self.logger.info("TOTP for user: %s", code)
 
     def verify_2fa(
         self, username: str, password: str, code: str, email: str
@@ -90,6 +93,7 @@ class UserService:
 
         Raises:
             Wrong2FAException: If the 2FA code is invalid, expired, or the secret is not found.
+            UserAlreadyExists: If the username or email was taken since registration started.
         """
         user_secret = self.redis_mem.get(f"2fa:{username}")
         if not user_secret:
@@ -98,10 +102,12 @@ class UserService:
         totp = pyotp.TOTP(str(user_secret), interval=self.token_life)
         if totp.verify(code):
             hashed_password = self.password_hasher.hash(password)
-            new_user_entity = db_models.UserEntity(
+            new_user_entity = self.user_repository.insert_unique(
                 username=username, password=hashed_password, email=email
             )
-            return self.user_repository.save(new_user_entity)
+            if new_user_entity is None:
+                raise UserAlreadyExists()
+            return new_user_entity
 
         raise Wrong2FAException(message="Invalid 2FA code")
 
@@ -123,7 +129,8 @@ class UserService:
                                          does not match.
         """
         user_entity = self.user_repository.get_by_username(username)
-        if user_entity and self._verify_password(user_entity.password, password):
+        hashed_password = user_entity.password if user_entity else DUMMY_PASSWORD_HASH
+        if self._verify_password(hashed_password, password) and user_entity:
             token = create_jwt_for_user(user_entity)
             return models.Token(access_token=token, token_type="bearer")
         raise InvalidCredentialsException
@@ -153,9 +160,6 @@ class UserService:
         Returns:
             A list containing only the usernames that correspond to actual users.
         """
-        found_users = []
-        for user in usernames:
-            user_entity = self.user_repository.get_by_username(user)
-            if user_entity:
-                found_users.append(user_entity.username)
-        return found_users
+        unique_usernames = list(dict.fromkeys(usernames))
+        existing = self.user_repository.get_existing_usernames(unique_usernames)
+        return [username for username in unique_usernames if username in existing]
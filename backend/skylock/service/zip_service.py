@@ -1,10 +1,86 @@
-import zipfile
 import io
+import os
+import zipfile
+import secrets
+import tempfile
+import time
+from collections import deque
+from contextlib import ExitStack
+from typing import IO, Iterator, NamedTuple, Optional
 from skylock.database import models as db_models
-from skylock.utils.storage import FileStorageService
+from skylock.utils.storage import CHUNK_SIZE, FileStorageService
 from skylock.utils.reddis_mem import redis_mem as s_redis_mem
 from skylock.utils.exceptions import ZipQueueError
 
+# Deletes the lock only if it still holds the token of the task releasing it.
+RELEASE_ZIP_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Archives up to this size are built in memory; larger ones spill to a temporary file.
+ZIP_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+# Streamed downloads are limited by the client's bandwidth, so they use zlib's fastest
+# level; archives stored as files keep the default level for a better ratio.
+DOWNLOAD_COMPRESS_LEVEL = 1
+
+# Deflating files smaller than this saves a few bytes at best, and often none.
+MIN_DEFLATE_SIZE = 256
+
+# Files in these formats are already compressed, so deflating them again costs CPU for nothing.
+STORED_EXTENSIONS = frozenset(
+    {
+        ".7z",
+        ".apk",
+        ".gif",
+        ".gz",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".mkv",
+        ".mp3",
+        ".mp4",
+        ".pdf",
+        ".png",
+        ".webm",
+        ".webp",
+        ".xz",
+        ".zip",
+    }
+)
+
+
+class ZipEntry(NamedTuple):
+    """A file, or an empty folder when `file_id` is None, to be written to an archive."""
+
+    path: str
+    file_id: Optional[str]
+    size: int
+
+
+class ZipChunkSink(io.RawIOBase):
+    """Unseekable binary sink that collects the output of a ZipFile until drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Returns everything written since the previous call."""
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
 
 class ZipService:
     """Handles creation of ZIP archives from folder structures."""
@@ -19,33 +95,53 @@ class ZipService:
         self._file_storage_service = file_storage_service
         self._redis_mem = redis_mem or s_redis_mem
 
-    def acquire_zip_lock(self, owner_id: str, path: str) -> str:
+    def acquire_zip_lock(self, owner_id: str, path: str) -> tuple[str, str]:
         """Attempts to acquire a lock for a zipping task in Redis.
 
         This prevents multiple zipping operations on the same folder path
-        for the same owner from running concurrently.
+        for the same owner from running concurrently. The lock holds a random
+        token, so only the task that acquired it can release it.
 
         Args:
             owner_id: The ID of the user or entity owning the folder.
             path: The path of the folder to be zipped.
 
         Returns:
-            The Redis key used for the lock if acquired successfully.
+            A tuple containing:
+                - The Redis key used for the lock.
+                - The token identifying this lock holder, needed to release it.
 
         Raises:
             ZipQueueError: If a zipping task for the specified owner and path
                            is already in progress or queued.
         """
         task_key = f"zip:{owner_id}:{path}"
-        if not self._redis_mem.set(task_key, "queued", nx=True, ex=3600):
+        token = secrets.token_hex(16)
+        if not self._redis_mem.set(task_key, token, nx=True, ex=3600):
             raise ZipQueueError("Zip task already in progress or queued for this folder.")
-        return task_key
+        return (task_key, token)
 
-    def create_zip_from_folder(self, folder: db_models.FolderEntity) -> tuple[io.BytesIO, int]:
-        """Creates a ZIP archive from a folder entity in memory.
+    def release_zip_lock(self, task_key: str, token: str) -> bool:
+        """Releases a zipping task lock if it is still held with the given token.
 
-        The archive is constructed by recursively adding files and subfolders
-        from the provided folder entity.
+        The check and the delete run atomically in a Lua script, so a lock that
+        expired and was acquired again by another task is left untouched.
+
+        Args:
+            task_key: The Redis key of the lock.
+            token: The token returned by `acquire_zip_lock`.
+
+        Returns:
+            True if the lock was released, False if it was no longer held with the token.
+        """
+        return bool(self._redis_mem.eval(RELEASE_ZIP_LOCK_SCRIPT, 1, task_key, token))
+
+    def create_zip_from_folder(self, folder: db_models.FolderEntity) -> tuple[IO[bytes], int]:
+        """Creates a ZIP archive from a folder entity in a spooled temporary file.
+
+        The archive is constructed by adding files and subfolders from the
+        provided folder entity, whose subtree must already be loaded. It is kept
+        in memory up to `ZIP_SPOOL_MAX_SIZE` bytes and moved to disk beyond that.
 
         Args:
             folder: The `db_models.FolderEntity` object representing the root
@@ -53,13 +149,19 @@ class ZipService:
 
         Returns:
             A tuple containing:
-                - An `io.BytesIO` object holding the ZIP archive data.
+                - A binary stream holding the ZIP archive data, positioned at its start.
+                  The caller is responsible for closing it.
                 - An integer representing the total size of the ZIP archive in bytes.
         """
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            self._add_folder_to_zip(zip_file, folder, "")
+        with ExitStack() as cleanup:
+            # the spool is closed if building the archive fails, and handed to the caller otherwise
+            zip_buffer = cleanup.enter_context(
+                tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE)
+            )
+            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                for _ in self._write_zip_entries(zip_file, self._list_zip_entries(folder, "")):
+                    pass
+            cleanup.pop_all()
         size = zip_buffer.tell()
         zip_buffer.seek(0)  # Reset buffer position to the beginning for reading
         return (zip_buffer, size)
@@ -68,7 +170,7 @@ class ZipService:
         """Creates a ZIP archive from a folder entity and returns its content as bytes.
 
         This is a convenience method that calls `create_zip_from_folder` and then
-        extracts the byte content from the `io.BytesIO` buffer.
+        reads the byte content from the returned stream.
 
         Args:
             folder: The `db_models.FolderEntity` object representing the root
@@ -80,35 +182,126 @@ class ZipService:
                 - An integer representing the total size of the ZIP archive in bytes.
         """
         zip_buffer, size = self.create_zip_from_folder(folder=folder)
-        return (zip_buffer.getvalue(), size)
+        with zip_buffer:
+            return (zip_buffer.read(), size)
+
+    def iter_zip_from_folder(self, folder: db_models.FolderEntity) -> Iterator[bytes]:
+        """Streams a ZIP archive of a folder entity as it is being compressed.
+
+        The folder's subtree, which must already be loaded, is read before this
+        method returns. The returned iterator only reads stored file contents, so
+        it can be consumed after the database session has been closed.
 
-    def _add_folder_to_zip(
-        self,
-        zip_file: zipfile.ZipFile,
-        folder: db_models.FolderEntity,
-        current_path: str,
-    ):
-        """Recursively adds a folder and its contents to an open ZipFile object.
+        Args:
+            folder: The `db_models.FolderEntity` object representing the root
+                    folder to be zipped.
+
+        Returns:
+            An iterator over consecutive chunks of the ZIP archive.
+        """
+        return self._stream_zip_entries(self._list_zip_entries(folder, ""))
+
+    def _stream_zip_entries(self, entries: list[ZipEntry]) -> Iterator[bytes]:
+        """Writes ZIP entries to an in-memory sink and yields its contents as they grow.
 
         (Private helper method)
 
         Args:
-            zip_file: The `zipfile.ZipFile` object to which contents are added.
-            folder: The `db_models.FolderEntity` currently being processed.
+            entries: The entries of the archive, in order.
+
+        Yields:
+            Consecutive chunks of the ZIP archive.
+        """
+        sink = ZipChunkSink()
+        with zipfile.ZipFile(
+            sink, "w", zipfile.ZIP_DEFLATED, compresslevel=DOWNLOAD_COMPRESS_LEVEL
+        ) as zip_file:
+            for _ in self._write_zip_entries(zip_file, entries):
+                if chunk := sink.drain():
+                    yield chunk
+        # the central directory is written when the archive is closed
+        if chunk := sink.drain():
+            yield chunk
+
+    def _list_zip_entries(
+        self, folder: db_models.FolderEntity, current_path: str
+    ) -> list[ZipEntry]:
+        """Lists the entries of a ZIP archive of a folder and its whole subtree.
+
+        (Private helper method)
+
+        The subtree is walked depth-first with an explicit stack, so arbitrarily deep
+        folders do not run into the interpreter's recursion limit.
+
+        Args:
+            folder: The `db_models.FolderEntity` at the top of the subtree.
             current_path: The path string representing the location of the `folder`
                           within the ZIP archive.
+
+        Returns:
+            The files of the subtree, and its empty folders, in archive order.
         """
-        folder_path = f"{current_path}{folder.name}/"
+        entries = []
+        pending = deque([(folder, current_path)])
+        while pending:
+            folder, current_path = pending.pop()
+            folder_path = f"{current_path}{folder.name}/"
+
+            if not folder.files and not folder.subfolders:
+                entries.append(ZipEntry(path=folder_path, file_id=None, size=0))
+
+            entries.extend(
+                ZipEntry(path=f"{folder_path}{file.name}", file_id=file.id, size=file.size)
+                for file in folder.files
+            )
+
+            # reversed, so subfolders are popped and listed in their original order
+            pending.extend((subfolder, folder_path) for subfolder in reversed(folder.subfolders))
+        return entries
+
+    def _write_zip_entries(
+        self, zip_file: zipfile.ZipFile, entries: list[ZipEntry]
+    ) -> Iterator[None]:
+        """Writes entries to an open ZipFile object, pausing after every chunk.
 
-        if not folder.files and not folder.subfolders:
-            zip_file.writestr(folder_path, "")
+        (Private helper method)
+
+        Stored files are copied in chunks straight into the compressor, so they are
+        never held in memory as a whole. Yielding after each chunk lets a streaming
+        caller pass on the compressed output before the next chunk is written.
+
+        Args:
+            zip_file: The `zipfile.ZipFile` object to which the entries are added.
+            entries: The entries to write, in order.
+
+        Yields:
+            None, after each chunk of file content has been written.
+        """
+        # every entry of one archive is stamped with the same time
+        date_time = time.localtime()[:6]
+        for entry in entries:
+            if entry.file_id is None:
+                folder_info = zipfile.ZipInfo(entry.path, date_time=date_time)
+                # the directory attributes writestr would set for a bare folder name
+                folder_info.external_attr = 0o40775 << 16 | 0x10
+                zip_file.writestr(folder_info, "")
+                continue
 
-        for file in folder.files:
-            file_path_in_zip = f"{folder_path}{file.name}"
-            file_content_stream = self._file_storage_service.get_file(file)
-            zip_file.writestr(file_path_in_zip, file_content_stream.read())
-            if hasattr(file_content_stream, "close"):
-                file_content_stream.close()
+            zip_info = zipfile.ZipInfo(entry.path, date_time=date_time)
+            extension = os.path.splitext(entry.path)[1].lower()
+            if entry.size < MIN_DEFLATE_SIZE or extension in STORED_EXTENSIONS:
+                zip_info.compress_type = zipfile.ZIP_STORED
+            else:
+                zip_info.compress_type = zip_file.compression
+                # ZipFile only applies its level to entries it creates itself;
+                # the attribute is public as compress_level from Python 3.13
+                zip_info._compresslevel = zip_file.compresslevel  # type: ignore[attr-defined]  # pylint: disable=protected-access
+            zip_info.external_attr = 0o600 << 16
+            # the known size lets zipfile decide on ZIP64 headers before streaming
+            zip_info.file_size = entry.size
 
-        for subfolder in folder.subfolders:
-            self._add_folder_to_zip(zip_file, subfolder, folder_path)
+            with self._file_storage_service.get_file_by_id(entry.file_id) as source:
+                with zip_file.open(zip_info, "w") as destination:
+                    while chunk := source.read(CHUNK_SIZE):
+                        destination.write(chunk)
+                        yield
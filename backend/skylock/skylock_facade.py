@@ -1,18 +1,32 @@
+from functools import cache
+from typing import IO
+
 from skylock.service.path_resolver import PathResolver
 from skylock.service.resource_service import ResourceService
 from skylock.service.response_builder import ResponseBuilder
 from skylock.service.user_service import UserService
 from skylock.service.zip_service import ZipService
-from skylock.service.dramatiq_tasks import create_zip_task
 from skylock.api import models
 from skylock.api.models import Privacy, FolderType
 from skylock.utils.exceptions import ForbiddenActionException, ResourceNotFoundException
 from skylock.utils.path import UserPath
 from skylock.utils.url_generator import UrlGenerator
 from skylock.database import models as db_models
+from skylock.database.repository import FILE_SHARING, FOLDER_CONTENTS
+
+
+@cache
+def _zip_task():
+    """Imports the zip actor on first use, so only processes that queue zips load dramatiq."""
+    from skylock.service.dramatiq_tasks import (  # pylint: disable=import-outside-toplevel
+        create_zip_task,
+    )
+
+    return create_zip_task
 
 
-class SkylockFacade:
+# the facade is the single entry point of the API and page routers, so it grows with them
+class SkylockFacade:  # pylint: disable=too-many-public-methods
     """
     Provides a unified interface to Skylock's core functionalities,
     orchestrating various services for user and resource management.
@@ -122,16 +136,17 @@ class SkylockFacade:
     def download_folder(self, user_path: UserPath) -> models.FolderData:
         """Downloads a folder as a ZIP archive.
 
-        Retrieves the folder, zips its contents, and prepares a download response.
+        Retrieves the folder and prepares a download response whose ZIP data is
+        compressed while it is being streamed.
 
         Args:
             user_path: The path of the folder to download.
 
         Returns:
-            A `models.FolderData` response model containing the folder name and ZIP data stream.
+            A `models.FolderData` response model containing the folder name and ZIP data chunks.
         """
-        folder = self._resource_service.get_folder(user_path)
-        data, _ = self._zip_service.create_zip_from_folder(folder)  # size is ignored here
+        folder = self._resource_service.get_folder_tree(user_path)
+        data = self._zip_service.iter_zip_from_folder(folder)
         return self._response_builder.get_folder_data_response(folder=folder, folder_data=data)
 
     def get_folder_contents(self, user_path: UserPath) -> models.FolderContents:
@@ -143,7 +158,7 @@ class SkylockFacade:
         Returns:
             A `models.FolderContents` response model detailing the folder's children.
         """
-        folder = self._resource_service.get_folder(user_path)
+        folder = self._resource_service.get_folder(user_path, options=FOLDER_CONTENTS)
         return self._response_builder.get_folder_contents_response(
             folder=folder, user_path=user_path
         )
@@ -157,7 +172,7 @@ class SkylockFacade:
         Returns:
             A `models.FolderContents` response model.
         """
-        folder = self._resource_service.get_public_folder(folder_id)
+        folder = self._resource_service.get_public_folder(folder_id, options=FOLDER_CONTENTS)
         path = self._path_resolver.path_from_folder(folder)
         return self._response_builder.get_folder_contents_response(folder=folder, user_path=path)
 
@@ -201,7 +216,7 @@ class SkylockFacade:
         """
         folder = self._resource_service.get_folder(user_path)
 
-        if not folder.privacy == Privacy.PUBLIC:
+        if folder.privacy != Privacy.PUBLIC:
             raise ForbiddenActionException(f"Folder {folder.name} is not public, cannot be shared")
 
         return self._url_generator.generate_url_for_folder(folder.id)
@@ -222,15 +237,16 @@ class SkylockFacade:
         Raises:
             ZipQueueError: If a zipping task for this folder is already in progress (from `_zip_service.acquire_zip_lock`).
         """
-        self._resource_service.zip_exists(user_path, force)
-
-        self._resource_service.get_folder(user_path)
-        task_key = self._zip_service.acquire_zip_lock(user_path.owner.id, user_path.path)
-        create_zip_task.send(
+        self._resource_service.prepare_zip(user_path, force)
+        task_key, lock_token = self._zip_service.acquire_zip_lock(
+            user_path.owner.id, user_path.path
+        )
+        _zip_task().send(
             user_path.owner.id,
             user_path.path,
             force,
             task_name=task_key,
+            lock_token=lock_token,
         )
         return {"message": "Zip generation started."}
 
@@ -238,8 +254,7 @@ class SkylockFacade:
     def upload_file(
         self,
         user_path: UserPath,
-        file_data: bytes,
-        size: int,
+        file_data: IO[bytes],
         force: bool = False,
         privacy: Privacy = Privacy.PRIVATE,
     ) -> models.File:
@@ -247,15 +262,14 @@ class SkylockFacade:
 
         Args:
             user_path: The full path (including filename) where the file should be stored.
-            file_data: The binary content of the file.
-            size: The size of the file in bytes.
+            file_data: A seekable binary stream with the content of the file.
             force: If True, overwrites an existing file at the same path.
             privacy: The privacy setting for the new file.
 
         Returns:
             A `models.File` response model representing the uploaded file.
         """
-        file = self._resource_service.create_file(user_path, file_data, size, force, privacy)
+        file = self._resource_service.create_file(user_path, file_data, force, privacy)
         return self._response_builder.get_file_response(file=file, user_path=user_path)
 
     def download_file(self, user_path: UserPath) -> models.FileData:
@@ -313,57 +327,34 @@ class SkylockFacade:
         Returns:
             A `models.File` response model representing the updated file.
         """
-        current_file = self._resource_service.get_file(user_path)
+        current_file = self._resource_service.get_file(user_path, options=FILE_SHARING)
 
         # PUBLIC, PROTECTED -> PRIVATE
         # delete shared_files connected to this file from all users
         if privacy == Privacy.PRIVATE:
-            current_shared_files = (
-                self._resource_service._shared_file_repository.get_shared_files_by_file_id(
-                    current_file.id
-                )
+            self._resource_service.unshare_file(
+                current_file.id, [sharing.user_id for sharing in current_file.shared_with]
             )
-            for shared_file in current_shared_files:
-                linked_file = self._resource_service._link_repository.get_by_file_id_and_owner_id(
-                    current_file.id, shared_file.user_id
-                )
-                if linked_file:
-                    folder_path = self._path_resolver.path_from_folder(linked_file.folder)
-                    self.delete_file(folder_path / linked_file.name)
-                self._resource_service._shared_file_repository.delete_shared_files_from_users(
-                    current_file.id, shared_file.user_id
-                )
             found = []
 
-        # PUBLIC -> PROTECTED
-        # delete shared_files from users that are not on shared_to list
-        elif privacy == Privacy.PROTECTED and current_file.privacy == Privacy.PUBLIC:
-            for sharing in current_file.shared_with:
-                if sharing.user.username not in set(current_file.shared_to).union(shared_to):
-                    linked_file = (
-                        self._resource_service._link_repository.get_by_file_id_and_owner_id(
-                            current_file.id, sharing.user_id
-                        )
-                    )
-                    if linked_file:
-                        folder_path = self._path_resolver.path_from_folder(linked_file.folder)
-                        self.delete_file(folder_path / linked_file.name)
-                    self._resource_service._shared_file_repository.delete_shared_files_from_users(
-                        current_file.id, sharing.user_id
-                    )
-            found = list(
-                set(current_file.shared_to).union(
-                    self._user_service.find_shared_to_users(shared_to)
-                )
-            )
-
-        # don't change anything in shared_files table
         else:
-            found = list(
-                set(current_file.shared_to).union(
-                    self._user_service.find_shared_to_users(shared_to)
+            shared_usernames = current_file.shared_to
+
+            # PUBLIC -> PROTECTED
+            # delete shared_files from users that are not on shared_to list
+            if privacy == Privacy.PROTECTED and current_file.privacy == Privacy.PUBLIC:
+                allowed_usernames = shared_usernames.union(shared_to)
+                self._resource_service.unshare_file(
+                    current_file.id,
+                    [
+                        sharing.user_id
+                        for sharing in current_file.shared_with
+                        if sharing.user.username not in allowed_usernames
+                    ],
                 )
-            )
+
+            # otherwise don't change anything in shared_files table
+            found = list(shared_usernames.union(self._user_service.find_shared_to_users(shared_to)))
         file = self._resource_service.update_file(user_path, privacy, found)
         return self._response_builder.get_file_response(file=file, user_path=user_path)
 
@@ -376,15 +367,7 @@ class SkylockFacade:
         Raises:
             ForbiddenActionException: If the resource at the path is not a file or link.
         """
-        resource_type = self._resource_service.check_resource_type(user_path)
-        if resource_type == models.ResourceType.FILE:
-            self._resource_service.delete_file(user_path)
-        elif resource_type == models.ResourceType.LINK:
-            self._resource_service.delete_link(user_path)
-        else:
-            raise ForbiddenActionException(
-                f"Resource at {user_path.path} is not a deletable file or link type."
-            )
+        self._resource_service.delete_file_or_link(user_path)
 
     def get_file_url(self, user_path: UserPath) -> str:
         """Generates a shareable URL for a file.
@@ -417,6 +400,18 @@ class SkylockFacade:
         path = self._path_resolver.path_from_file(file)
         return self._response_builder.get_file_response(file=file, user_path=path)
 
+    def is_file_shared_with(self, file_id: str, user_id: str) -> bool:
+        """Checks if a file is shared with a user.
+
+        Args:
+            file_id: The unique ID of the file.
+            user_id: The ID of the user.
+
+        Returns:
+            True if the file is shared with the user, False otherwise.
+        """
+        return self._resource_service.is_file_shared_with(file_id, user_id)
+
     def configure_new_user(self, user: db_models.UserEntity) -> None:
         """Sets up initial resources for a newly registered user.
 
@@ -1,5 +1,9 @@
+import json
+from functools import lru_cache
+from typing import Callable
+
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from skylock.utils.exceptions import (
     FolderNotEmptyException,
@@ -16,44 +20,24 @@ from skylock.utils.exceptions import (
     ZipQueueError,
 )
 
+ExceptionHandler = Callable[[Request, Exception], Response]
 
-def user_already_exists_handler(_request: Request, exc: UserAlreadyExists) -> JSONResponse:
-    return JSONResponse(
-        status_code=409,
-        content={"detail": str(exc)},
-    )
 
+@lru_cache(maxsize=64)
+def _detail_body(detail: str) -> bytes:
+    """Serializes an error detail once; handlers almost always see the default message."""
+    return json.dumps({"detail": detail}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-def invalid_credentials_handler(
-    _request: Request, exc: InvalidCredentialsException
-) -> JSONResponse:
-    return JSONResponse(
-        status_code=401,
-        content={"detail": str(exc)},
-    )
 
+def _simple(status_code: int) -> ExceptionHandler:
+    def handler(_request: Request, exc: Exception) -> Response:
+        return Response(
+            content=_detail_body(str(exc)),
+            status_code=status_code,
+            media_type="application/json",
+        )
 
-def user_not_found_handler(_request: Request, exc: UserNotFoundException) -> JSONResponse:
-    return JSONResponse(
-        status_code=404,
-        content={"detail": str(exc)},
-    )
-
-
-def resource_already_exists_handler(
-    _request: Request, exc: ResourceAlreadyExistsException
-) -> JSONResponse:
-    return JSONResponse(
-        status_code=409,
-        content={"detail": str(exc)},
-    )
-
-
-def invalid_path_handler(_request: Request, exc: InvalidPathException) -> JSONResponse:
-    return JSONResponse(
-        status_code=400,
-        content={"detail": str(exc)},
-    )
+    return handler
 
 
 def resource_not_found_handler(_request: Request, exc: ResourceNotFoundException) -> JSONResponse:
@@ -63,53 +47,17 @@ def resource_not_found_handler(_request: Request, exc: ResourceNotFoundException
     )
 
 
-def folder_not_empty_handler(_request: Request, exc: FolderNotEmptyException) -> JSONResponse:
-    return JSONResponse(
-        status_code=409,
-        content={"detail": str(exc)},
-    )
-
-
-def forbidden_action_handler(_request: Request, exc: ForbiddenActionException) -> JSONResponse:
-    return JSONResponse(
-        status_code=403,
-        content={"detail": str(exc)},
-    )
-
-
-def wrong_code_handler(_request: Request, exc: Wrong2FAException) -> JSONResponse:
-    return JSONResponse(
-        status_code=401,
-        content={"detail": str(exc)},
-    )
-
-
-def email_authentication_error_handler(
-    _request: Request, exc: EmailAuthenticationError
-) -> JSONResponse:
-    return JSONResponse(
-        status_code=503,
-        content={
-            "detail": str(exc),
-        },
-    )
-
-
-def email_service_unavailable_handler(
-    _request: Request, exc: EmailServiceUnavailable
-) -> JSONResponse:
-    return JSONResponse(
-        status_code=503,
-        content={
-            "detail": str(exc),
-        },
-    )
-
-
-def zip_queue_error_handler(_request: Request, exc: ZipQueueError) -> JSONResponse:
-    return JSONResponse(
-        status_code=403,
-        content={
-            "detail": str(exc),
-        },
-    )
+HANDLER_MAP: dict[type[Exception], ExceptionHandler] = {
+    UserAlreadyExists: _simple(409),
+    InvalidCredentialsException: _simple(401),
+    UserNotFoundException: _simple(404),
+    ResourceAlreadyExistsException: _simple(409),
+    ResourceNotFoundException: resource_not_found_handler,  # type: ignore[dict-item]
+    FolderNotEmptyException: _simple(409),
+    ForbiddenActionException: _simple(403),
+    Wrong2FAException: _simple(401),
+    InvalidPathException: _simple(400),
+    EmailAuthenticationError: _simple(503),
+    EmailServiceUnavailable: _simple(503),
+    ZipQueueError: _simple(403),
+}
@@ -1,9 +1,20 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 logger = logging.getLogger("skylock")
 
-if not any(isinstance(h, logging.FileHandler) for h in logger.handlers):
+if not logger.handlers:
     log_file = logging.FileHandler("totp.log")
-    log_file.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-    logger.addHandler(log_file)
+    log_file.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    # the file is written by a listener thread, so logging calls only enqueue the record
+    log_queue: queue.Queue = queue.Queue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, log_file)
+    listener.start()
+    atexit.register(listener.stop)
@@ -1,4 +1,5 @@
 import pathlib
+from functools import cached_property
 
 from skylock.database.models import UserEntity
 from skylock.utils.exceptions import ForbiddenActionException, InvalidPathException
@@ -13,12 +14,25 @@ class UserPath:
     def root_folder_of(cls, owner: UserEntity) -> "UserPath":
         return cls(path="", owner=owner)
 
-    @property
+    @classmethod
+    def _from_parsed(cls, parsed_path: pathlib.PurePosixPath, owner: UserEntity) -> "UserPath":
+        # ancestors of an already validated path need no second validation
+        user_path = cls.__new__(cls)
+        user_path._parsed_path = parsed_path
+        user_path._owner = owner
+        return user_path
+
+    # the path never changes after construction, so derived values are computed once
+    @cached_property
     def path(self) -> str:
         if self.is_root_folder():
             return ""
         return str(self._parsed_path)
 
+    @cached_property
+    def abs_path(self) -> str:
+        return f"/{self.path}"
+
     @property
     def owner(self) -> UserEntity:
         return self._owner
@@ -27,30 +41,30 @@ class UserPath:
     def root_folder_name(self) -> str:
         return self._owner.id
 
-    @property
+    @cached_property
     def parts(self) -> tuple[str, ...]:
         return self._parsed_path.parts
 
-    @property
+    @cached_property
     def parent(self) -> "UserPath":
         if self.is_root_folder():
             raise ForbiddenActionException("You cannot access parent of root folder")
-        return UserPath(path=str(self._parsed_path.parent), owner=self._owner)
+        return UserPath._from_parsed(self._parsed_path.parent, self._owner)
 
-    @property
+    @cached_property
     def parents(self) -> tuple["UserPath", ...]:
         if self.is_root_folder():
             raise ForbiddenActionException("You cannot access parent of root folder")
         return tuple(
-            UserPath(path=str(parent), owner=self._owner) for parent in self._parsed_path.parents
+            UserPath._from_parsed(parent, self._owner) for parent in self._parsed_path.parents
         )
 
-    @property
+    @cached_property
     def name(self) -> str:
         return str(self._parsed_path.name)
 
     def is_root_folder(self):
-        return self._parsed_path == pathlib.PurePosixPath("")
+        return not self.parts
 
     def _validate_and_parse_path(self, initial_path: str) -> pathlib.PurePosixPath:
         max_length = 255
@@ -10,7 +10,7 @@ DEFAULT_RATE_LIMIT: str = "1/second"
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=[DEFAULT_RATE_LIMIT],
-    strategy="fixed-window",
+    strategy="moving-window",
     storage_uri=REDIS_URL_RATELIMIT,
     enabled=RATE_LIMITING_ENABLED,
 )
@@ -1,4 +1,13 @@
 import redis
-from skylock.config import REDIS_HOST, REDIS_PORT
+from skylock.config import REDIS_HOST, REDIS_MAX_CONNECTIONS, REDIS_PORT
 
-redis_mem = redis.Redis(host=REDIS_HOST, port=int(REDIS_PORT), decode_responses=True)
+# a bounded pool shared by all request threads; callers wait for a free connection
+# instead of opening a new one per concurrent command
+redis_pool = redis.BlockingConnectionPool(
+    host=REDIS_HOST,
+    port=int(REDIS_PORT),
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=2,
+    decode_responses=True,
+)
+redis_mem = redis.Redis(connection_pool=redis_pool)
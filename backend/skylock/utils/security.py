@@ -12,6 +12,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+BEARER_PREFIX = "Bearer "
+DECODE_OPTIONS = {"require_exp": True, "require_sub": True}
 
 
 def get_user_from_jwt(token: str, user_repository: UserRepository) -> db_models.UserEntity:
@@ -41,4 +43,10 @@ def create_jwt_for_user(user: db_models.UserEntity) -> str:
 
 
 def decode_jwt(token: str) -> dict:
-    return jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
+    return jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM], options=DECODE_OPTIONS)
+
+
+def strip_bearer_prefix(token: str) -> str:
+    if token.startswith(BEARER_PREFIX):
+        return token[len(BEARER_PREFIX) :]
+    return token
@@ -1,11 +1,27 @@
+import os
 import pathlib
 import shutil
-from io import BytesIO
-from typing import IO
+from typing import IO, Iterable, Iterator
 
 from skylock.database import models as db_models
 
 FILES_FOLDER_DISK_PATH = "./data/files"
+CHUNK_SIZE = 1024 * 1024
+
+
+def iter_chunks(stream: IO[bytes], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yields a binary stream in fixed-size chunks and closes it once exhausted."""
+    with stream:
+        while chunk := stream.read(chunk_size):
+            yield chunk
+
+
+def stream_size(stream: IO[bytes]) -> int:
+    """Returns the number of bytes left in a seekable stream without reading them."""
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END) - position
+    stream.seek(position)
+    return size
 
 
 class FileStorageService:
@@ -16,7 +32,7 @@ class FileStorageService:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         return self.storage_path
 
-    def save_file(self, data: bytes, file: db_models.FileEntity) -> None:
+    def save_file(self, data: IO[bytes], file: db_models.FileEntity) -> None:
         filename = self._get_filename(file)
 
         folder = self._ensure_files_folder()
@@ -25,19 +41,27 @@ class FileStorageService:
         if path.exists():
             raise ValueError(f"File of given path: {path} already exists")
 
-        with path.open("wb") as buffer:
-            shutil.copyfileobj(BytesIO(data), buffer)
+        # written under a temporary name so readers never observe a partial file
+        partial_path = path.with_name(f"{filename}.part")
+        try:
+            with partial_path.open("wb") as buffer:
+                shutil.copyfileobj(data, buffer, CHUNK_SIZE)
+            partial_path.replace(path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
 
     def get_file(self, file: db_models.FileEntity) -> IO[bytes]:
-        filename = self._get_filename(file)
+        return self.get_file_by_id(self._get_filename(file))
 
+    def get_file_by_id(self, file_id: str) -> IO[bytes]:
         folder = self._ensure_files_folder()
-        path = folder / filename
+        path = folder / file_id
 
         if not path.exists():
             raise ValueError(f"File of given path: {path} does not exist")
 
-        return BytesIO(path.read_bytes())
+        return path.open("rb")
 
     def delete_file(self, file: db_models.FileEntity) -> None:
         filename = self._get_filename(file)
@@ -50,5 +74,10 @@ class FileStorageService:
 
         path.unlink()
 
+    def delete_files(self, file_ids: Iterable[str]) -> None:
+        folder = self._ensure_files_folder()
+        for file_id in file_ids:
+            (folder / file_id).unlink(missing_ok=True)
+
     def _get_filename(self, file: db_models.FileEntity) -> str:
         return file.id
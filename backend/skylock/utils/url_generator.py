@@ -1,3 +1,6 @@
+from typing import Iterable
+
+
 class UrlGenerator:
     def generate_url_for_file(self, file_id: str) -> str:
         return f"/files/{file_id}"
@@ -5,6 +8,12 @@ class UrlGenerator:
     def generate_url_for_folder(self, folder_id: str) -> str:
         return f"/folders/{folder_id}"
 
+    def generate_urls_for_files(self, file_ids: Iterable[str]) -> list[str]:
+        return [f"/files/{file_id}" for file_id in file_ids]
+
+    def generate_urls_for_folders(self, folder_ids: Iterable[str]) -> list[str]:
+        return [f"/folders/{folder_id}" for folder_id in folder_ids]
+
     def generate_download_url_for_file(self, file_id: str) -> str:
         return f"/api/v1/shared/files/download/id/{file_id}"
 
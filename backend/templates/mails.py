@@ -22,7 +22,7 @@ def two_fa_code_mail(username: str, token_code: str, token_life: int) -> str:
             {token_code}
             </p>
             <p>
-            Please note that the code will expire in {token_life / 60} minutes
+            Please note that the code will expire in {token_life // 60} minutes
             If you did not initiate this request, please disregard this email.
             </p>
             <p>
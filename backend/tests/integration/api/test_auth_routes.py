@@ -1,5 +1,3 @@
-import argon2
-
 from unittest.mock import patch
 
 from skylock.database.models import UserEntity
@@ -80,41 +78,3 @@ def test_authenticate_user_wrong_2fa(verify_mock, configure_mock, client):
 
     assert response.status_code == 401
     assert response.json()["detail"] == "Wrong 2FA code"
-
-
-# def test_login_user_success(client, db_session):
-#     username = "loginuser"
-#     password = "securepassword"
-#     email = "test@example.com"
-
-#     existing_user = UserEntity(
-#         id=1,
-#         username=username,
-#         password=argon2.PasswordHasher().hash(password),
-#         email=email,
-#     )
-
-#     db_session.add(existing_user)
-#     db_session.commit()
-
-
-#     def mock_limiter(*args, **kwargs):
-#         def decorator(f):
-#             return f
-#         return decorator
-
-#     response = client.post("/auth/login", json={"username": username, "password": password})
-
-#     assert response.status_code == 200
-#     assert response.json()["access_token"] is not None
-#     assert response.json()["token_type"] == "bearer"
-
-
-# def test_login_user_invalid_credentials(client):
-#     username = "invaliduser"
-#     password = "wrongpassword"
-
-#     response = client.post("/auth/login", json={"username": username, "password": password})
-
-#     assert response.status_code == 401
-#     assert response.json()["detail"] == "Invalid credentials provided"
@@ -9,8 +9,8 @@ def preconfigured_files(skylock, mock_user):
     user_path_file1 = UserPath(path="file1.txt", owner=mock_user)
     user_path_file2 = UserPath(path="folder1/file2.txt", owner=mock_user)
     skylock.create_folder(user_path_folder)
-    skylock.upload_file(user_path=user_path_file1, file_data=b"File 1 content", size=10)
-    skylock.upload_file(user_path=user_path_file2, file_data=b"File 2 content", size=20)
+    skylock.upload_file(user_path=user_path_file1, file_data=BytesIO(b"File 1 content"))
+    skylock.upload_file(user_path=user_path_file2, file_data=BytesIO(b"File 2 content"))
 
 
 # GET methods
@@ -35,6 +35,7 @@ def test_upload_file_success(client, mock_user, skylock):
     file_data = {"file": ("file3.txt", b"File 1 content")}
     response = client.post("/files/upload/file3.txt", files=file_data)
     assert response.status_code == 201
+    assert response.json()["size"] == len(b"File 1 content")
     assert (
         skylock.download_file(UserPath(path="file3.txt", owner=mock_user)).data.read()
         == b"File 1 content"
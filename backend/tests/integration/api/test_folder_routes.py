@@ -1,5 +1,18 @@
+import zipfile
+from io import BytesIO
+
 import pytest
+from sqlalchemy import func, select
+
 from skylock.api.routes import folder_routes
+from skylock.database.models import (
+    FileEntity,
+    FolderEntity,
+    LinkEntity,
+    SharedFileEntity,
+    UserEntity,
+    file_shared_users,
+)
 from skylock.utils.path import UserPath
 from skylock.database.models import Privacy
 
@@ -38,6 +51,54 @@ def test_get_nested_folder(client):
     assert response.json()["folders"][1]["path"] == "/folder1/subfolder2"
 
 
+def test_download_folder_success(client, skylock, mock_user):
+    skylock.upload_file(
+        UserPath(path="folder1/subfolder1/file.txt", owner=mock_user), BytesIO(b"content")
+    )
+
+    response = client.get("/download/folders/folder1")
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(BytesIO(response.content)) as archive:
+        assert archive.namelist() == ["folder1/subfolder1/file.txt", "folder1/subfolder2/"]
+        assert archive.read("folder1/subfolder1/file.txt") == b"content"
+
+
+def test_download_folder_stores_compressed_formats(client, skylock, mock_user):
+    jpeg = b"jpeg" * 100
+    text = b"text" * 100
+    skylock.upload_file(UserPath(path="folder2/photo.JPG", owner=mock_user), BytesIO(jpeg))
+    skylock.upload_file(UserPath(path="folder2/notes.txt", owner=mock_user), BytesIO(text))
+
+    response = client.get("/download/folders/folder2")
+
+    with zipfile.ZipFile(BytesIO(response.content)) as archive:
+        assert archive.getinfo("folder2/photo.JPG").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("folder2/notes.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert archive.read("folder2/photo.JPG") == jpeg
+
+
+def test_download_folder_stores_tiny_files(client, skylock, mock_user):
+    skylock.upload_file(UserPath(path="folder2/notes.txt", owner=mock_user), BytesIO(b"text"))
+
+    response = client.get("/download/folders/folder2")
+
+    with zipfile.ZipFile(BytesIO(response.content)) as archive:
+        assert archive.getinfo("folder2/notes.txt").compress_type == zipfile.ZIP_STORED
+        assert archive.read("folder2/notes.txt") == b"text"
+
+
+def test_download_folder_streams_after_session_is_closed(skylock, mock_user, db_session):
+    skylock.upload_file(UserPath(path="folder2/file.txt", owner=mock_user), BytesIO(b"content"))
+
+    folder_data = skylock.download_folder(UserPath(path="folder2", owner=mock_user))
+    db_session.commit()
+    db_session.close()
+
+    with zipfile.ZipFile(BytesIO(b"".join(folder_data.data))) as archive:
+        assert archive.read("folder2/file.txt") == b"content"
+
+
 # POST METHODS
 def test_create_folder_at_root_success(client):
     response = client.post("/folders/new_folder/")
@@ -101,6 +162,38 @@ def test_delete_not_found(client):
     assert response.status_code == 404
 
 
+def test_delete_folder_recursively_removes_subtree(
+    client, skylock, resource_service, mock_user, db_session
+):
+    bob = UserEntity(username="bob", password="passwd", email="bob@example.com")
+    db_session.add(bob)
+    db_session.commit()
+    skylock.configure_new_user(bob)
+
+    file_path = UserPath(path="folder1/subfolder1/file.txt", owner=mock_user)
+    file = skylock.upload_file(file_path, BytesIO(b"content"))
+    skylock.update_file(file_path, Privacy.PROTECTED, ["bob"])
+    resource_service.potential_file_import(bob.id, file.id)
+
+    response = client.delete("/folders/folder1", params={"recursive": True})
+
+    assert response.status_code == 204
+    for query in (
+        select(func.count()).select_from(FileEntity).where(FileEntity.id == file.id),
+        select(func.count()).select_from(LinkEntity).where(LinkEntity.target_file_id == file.id),
+        select(func.count())
+        .select_from(SharedFileEntity)
+        .where(SharedFileEntity.file_id == file.id),
+        select(func.count())
+        .select_from(file_shared_users)
+        .where(file_shared_users.c.file_id == file.id),
+        select(func.count())
+        .select_from(FolderEntity)
+        .where(FolderEntity.owner_id == bob.id, FolderEntity.name == mock_user.username),
+    ):
+        assert db_session.execute(query).scalar() == 0
+
+
 # PATCH METHODS
 def test_update_folder_visibility_success(client):
     response = client.patch(
@@ -3,8 +3,8 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import StaticPool, create_engine, event
+from sqlalchemy.orm import Session
 from slowapi import Limiter
 
 from skylock.api.dependencies import get_current_user, get_skylock_facade
@@ -36,24 +36,46 @@ MOCK_PASSWORD = "mockpasswd"
 MOCK_EMAIL = "mock@example.com"
 
 
-@pytest.fixture
-def db_session():
+@pytest.fixture(scope="session")
+def db_engine():
     engine = create_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
 
+    # pysqlite manages transactions itself and breaks SAVEPOINTs; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+        # the subtree of a deleted folder is removed by ON DELETE CASCADE, as in production
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
 
-    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = factory()
+
+@pytest.fixture
+def db_session(db_engine):
+    # every test runs inside an outer transaction that is rolled back afterwards;
+    # commits made by the code under test only release savepoints within it
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
 
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture
@@ -165,15 +187,19 @@ def mock_rate_limiter():
     return noop_decorator
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
 def test_app(skylock, db_session, mock_user):
     api.dependency_overrides[get_skylock_facade] = lambda: skylock
     api.dependency_overrides[get_db_session] = lambda: db_session
     api.dependency_overrides[get_current_user] = lambda: mock_user
-    return api
+    try:
+        yield api
+    finally:
+        api.dependency_overrides.clear()
 
 
-@pytest.fixture
-def client(test_app):
-    with TestClient(test_app) as c:
+@pytest.fixture(scope="session")
+def client():
+    # the app and its lifespan are shared; test_app points the overrides at each test's session
+    with TestClient(api) as c:
         yield c
@@ -114,6 +114,8 @@ def test_build_file_page_not_shared(html_builder):
     html_builder.build_login_page = MagicMock()
     html_builder.build_login_page.return_value = "login_page"
 
+    html_builder._skylock.is_file_shared_with.return_value = False
+
     user = UserEntity(id="user_id", username="me")
 
     with patch(
@@ -124,3 +126,4 @@ def test_build_file_page_not_shared(html_builder):
         html_builder.build_login_page.assert_called_once_with(
             request, "file_id", "File not shared with you"
         )
+        html_builder._skylock.is_file_shared_with.assert_called_once_with("file_id", "user_id")
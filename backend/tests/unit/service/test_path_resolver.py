@@ -1,6 +1,12 @@
 from starlette.responses import FileResponse
-from skylock.database.models import FileEntity, FolderEntity, UserEntity
-from skylock.database.repository import FolderRepository, UserRepository, FileRepository
+from skylock.api.models import ResourceType
+from skylock.database.models import FileEntity, FolderEntity, LinkEntity, UserEntity
+from skylock.database.repository import (
+    FOLDER_CONTENTS,
+    FolderRepository,
+    UserRepository,
+    FileRepository,
+)
 from skylock.utils.exceptions import ResourceNotFoundException
 from skylock.utils.path import UserPath
 import pytest
@@ -111,7 +117,7 @@ def test_folder_from_path_root_success(path_resolver):
     user = path_resolver._user_repository.get_by_username("testuser")
     user_path = UserPath.root_folder_of(user)
 
-    result = path_resolver.folder_from_path(user_path)
+    result = path_resolver.folder_from_path(user_path, options=FOLDER_CONTENTS)
     assert result.id == "folder-123"
     assert result.name == user.id
     assert len(result.subfolders) == 1
@@ -121,7 +127,7 @@ def test_folder_from_path_subfolder_success(path_resolver):
     user = path_resolver._user_repository.get_by_username("testuser")
     user_path = UserPath(path="test_folder", owner=user)
 
-    result = path_resolver.folder_from_path(user_path)
+    result = path_resolver.folder_from_path(user_path, options=FOLDER_CONTENTS)
     assert result.id == "folder-456"
     assert result.name == "test_folder"
     assert len(result.subfolders) == 1
@@ -131,7 +137,7 @@ def test_folder_from_path_deep_subfolder_success(path_resolver):
     user = path_resolver._user_repository.get_by_username("testuser")
     user_path = UserPath(path="test_folder/test_subfolder", owner=user)
 
-    result = path_resolver.folder_from_path(user_path)
+    result = path_resolver.folder_from_path(user_path, options=FOLDER_CONTENTS)
     assert result.id == "folder-789"
     assert result.name == "test_subfolder"
     assert len(result.subfolders) == 0
@@ -221,3 +227,76 @@ def test_path_from_folder_LookupError(path_resolver):
 
     with pytest.raises(LookupError):
         path_resolver.path_from_folder(folder)
+
+
+def test_resolve_any(path_resolver, db_session):
+    user = path_resolver._user_repository.get_by_username("testuser")
+    db_session.add(
+        LinkEntity(
+            id="link-123",
+            name="test_link",
+            folder_id="folder-123",
+            owner_id=user.id,
+            resource_type=ResourceType.FILE,
+            target_file_id="file-456",
+        )
+    )
+    db_session.commit()
+
+    assert path_resolver.resolve_any(UserPath.root_folder_of(user)) == (
+        ResourceType.FOLDER,
+        "folder-123",
+    )
+    assert path_resolver.resolve_any(UserPath("test_file", user)) == (
+        ResourceType.FILE,
+        "file-123",
+    )
+    assert path_resolver.resolve_any(UserPath("test_link", user)) == (
+        ResourceType.LINK,
+        "link-123",
+    )
+    assert path_resolver.resolve_any(UserPath("test_folder/test_subfolder", user)) == (
+        ResourceType.FOLDER,
+        "folder-789",
+    )
+
+
+def test_resolve_any_not_found(path_resolver):
+    user = path_resolver._user_repository.get_by_username("testuser")
+
+    with pytest.raises(ResourceNotFoundException):
+        path_resolver.resolve_any(UserPath("test_folder/missing", user))
+
+
+def test_existing_prefix(path_resolver):
+    user = path_resolver._user_repository.get_by_username("testuser")
+
+    folder, depth = path_resolver.existing_prefix(UserPath("test_folder/new/newer", user))
+    assert (folder.id, depth) == ("folder-456", 1)
+
+    folder, depth = path_resolver.existing_prefix(UserPath("test_folder/test_subfolder", user))
+    assert (folder.id, depth) == ("folder-789", 2)
+
+    folder, depth = path_resolver.existing_prefix(UserPath("test_file/new", user))
+    assert (folder.id, depth) == ("folder-123", 0)
+
+
+def test_existing_prefix_LookupError(path_resolver):
+    user = UserEntity(id="other-user", username="other-testuser")
+
+    with pytest.raises(LookupError):
+        path_resolver.existing_prefix(UserPath("test_folder", user))
+
+
+def test_find_folder(path_resolver):
+    user = path_resolver._user_repository.get_by_username("testuser")
+
+    assert path_resolver.find_folder(UserPath("test_folder", user)).id == "folder-456"
+    assert path_resolver.find_folder(UserPath("test_folder/missing", user)) is None
+
+
+def test_find_any_missing_parent(path_resolver):
+    user = path_resolver._user_repository.get_by_username("testuser")
+
+    assert path_resolver.find_any(UserPath("missing/test_file", user)) is None
+    assert path_resolver.find_any(UserPath("test_file", user)) == (ResourceType.FILE, "file-123")
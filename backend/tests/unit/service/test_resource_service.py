@@ -18,6 +18,7 @@ from skylock.api.models import Privacy, FolderType, ResourceType
 from fastapi import HTTPException
 from types import SimpleNamespace
 from pathlib import Path
+from io import BytesIO
 
 
 def test_get_root_folder_success(resource_service, mock_folder_repository):
@@ -30,7 +31,7 @@ def test_get_root_folder_success(resource_service, mock_folder_repository):
     result = resource_service.get_folder(user_path)
     assert result == root_folder
     mock_folder_repository.get_by_name_and_parent_id.assert_called_once_with(
-        name=root_folder.name, parent_id=None
+        name=root_folder.name, parent_id=None, options=()
     )
 
 
@@ -71,15 +72,31 @@ def test_get_subfolder_nonexistent(resource_service, mock_folder_repository):
         resource_service.get_folder(user_path)
 
 
+def test_get_folder_tree_loads_subtree(resource_service, mock_folder_repository):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath(path="test_folder", owner=user)
+    root_folder = FolderEntity(id="folder-456", name=user_path.root_folder_name, owner=user)
+    subfolder = FolderEntity(id="folder-789", name="test_folder", owner=user)
+    loaded_subtree = FolderEntity(id="folder-789", name="test_folder", owner=user)
+
+    mock_folder_repository.get_by_name_and_parent_id.side_effect = [root_folder, subfolder]
+    mock_folder_repository.get_subtree.return_value = loaded_subtree
+
+    assert resource_service.get_folder_tree(user_path) is loaded_subtree
+    mock_folder_repository.get_subtree.assert_called_once_with("folder-789")
+
+
 def test_create_folder_success(resource_service, mock_folder_repository):
     user = UserEntity(id="user-123", username="testuser")
     user_path = UserPath("subfolder", user)
     root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
 
     mock_folder_repository.get_by_name_and_parent_id.side_effect = [root_folder]
+    mock_folder_repository.child_name_exists.return_value = False
 
     resource_service.create_folder(user_path)
     mock_folder_repository.save.assert_called_once()
+    mock_folder_repository.child_name_exists.assert_called_once_with("folder-root", "subfolder")
 
 
 def test_create_folder_root_forbidden(resource_service):
@@ -90,19 +107,87 @@ def test_create_folder_root_forbidden(resource_service):
         resource_service.create_folder(user_path)
 
 
+def test_create_folder_with_parents_creates_missing_suffix(
+    resource_service, mock_folder_repository
+):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("existing/new/newer", user)
+    existing = FolderEntity(id="folder-456", name="existing", owner=user)
+
+    mock_folder_repository.get_deepest_on_path.return_value = (existing, 1)
+    mock_folder_repository.child_name_exists.return_value = False
+    mock_folder_repository.save.side_effect = lambda folder: folder
+
+    result = resource_service.create_folder_with_parents(user_path)
+
+    assert result.name == "newer"
+    assert result.parent_folder.name == "new"
+    assert result.parent_folder.parent_folder is existing
+    mock_folder_repository.get_deepest_on_path.assert_called_once_with(
+        "user-123", ("existing", "new", "newer")
+    )
+    mock_folder_repository.child_name_exists.assert_called_once_with("folder-456", "new")
+    mock_folder_repository.save.assert_called_once()
+
+
+def test_create_folder_with_parents_existing(resource_service, mock_folder_repository):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("existing", user)
+    existing = FolderEntity(id="folder-456", name="existing", owner=user)
+
+    mock_folder_repository.get_deepest_on_path.return_value = (existing, 1)
+
+    with pytest.raises(ResourceAlreadyExistsException):
+        resource_service.create_folder_with_parents(user_path)
+    mock_folder_repository.save.assert_not_called()
+
+
 def test_create_folder_duplicate_name(resource_service, mock_folder_repository):
     user = UserEntity(id="user-123", username="testuser")
     user_path = UserPath("subfolder", user)
     root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
-    existing_folder = FolderEntity(id="folder-456", name="subfolder", parent_folder=root_folder)
-
     mock_folder_repository.get_by_name_and_parent_id.side_effect = [root_folder]
+    mock_folder_repository.child_name_exists.return_value = True
 
     with pytest.raises(ResourceAlreadyExistsException):
         resource_service.create_folder(user_path)
 
 
-def test_delete_folder_success(resource_service, mock_folder_repository):
+def test_update_folder_recursive_updates_subtree_in_bulk(
+    resource_service, mock_folder_repository, mock_file_repository
+):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("subfolder", user)
+    root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
+    subfolder = FolderEntity(
+        id="folder-456", name="subfolder", parent_folder_id=root_folder.id, type=FolderType.NORMAL
+    )
+    mock_folder_repository.get_by_name_and_parent_id.side_effect = [root_folder, subfolder]
+    mock_folder_repository.collect_descendant_ids.return_value = ["folder-789"]
+
+    result = resource_service.update_folder(user_path, Privacy.PUBLIC, recursive=True)
+
+    assert result == subfolder
+    subtree_ids = ["folder-456", "folder-789"]
+    mock_folder_repository.bulk_set_privacy.assert_called_once_with(subtree_ids, Privacy.PUBLIC)
+    mock_file_repository.bulk_set_privacy_by_folder_ids.assert_called_once_with(
+        subtree_ids, Privacy.PUBLIC
+    )
+
+
+def test_update_folder_skips_special_folder(resource_service, mock_folder_repository):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("Shared", user)
+    root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
+    shared_folder = FolderEntity(id="folder-456", name="Shared", type=FolderType.SHARED)
+    mock_folder_repository.get_by_name_and_parent_id.side_effect = [root_folder, shared_folder]
+
+    resource_service.update_folder(user_path, Privacy.PUBLIC, recursive=True)
+
+    mock_folder_repository.bulk_set_privacy.assert_not_called()
+
+
+def test_delete_folder_success(resource_service, mock_folder_repository, mock_file_repository):
     user = UserEntity(id="user-123", username="testuser")
     user_path = UserPath("subfolder", user)
     root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
@@ -112,9 +197,14 @@ def test_delete_folder_success(resource_service, mock_folder_repository):
         root_folder,
         subfolder,
     ]
+    mock_folder_repository.has_children.return_value = False
+    mock_folder_repository.collect_descendant_ids.return_value = []
+    mock_file_repository.get_ids_by_folder_ids.return_value = []
+
+    with patch.object(resource_service, "_delete_files_data"):
+        resource_service.delete_folder(user_path)
 
-    resource_service.delete_folder(user_path)
-    mock_folder_repository.delete.assert_called_once_with(subfolder)
+    mock_folder_repository.delete_by_id.assert_called_once_with("folder-456")
 
 
 def test_delete_folder_not_empty(resource_service, mock_folder_repository):
@@ -122,21 +212,19 @@ def test_delete_folder_not_empty(resource_service, mock_folder_repository):
     user_path = UserPath("subfolder", user)
     root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
     subfolder = FolderEntity(id="folder-456", name="subfolder", parent_folder_id=root_folder.id)
-    sub_subfolder = FolderEntity(
-        id="folder-789", name="sub_subfolder", parent_folder_id=subfolder.id
-    )
-    subfolder.subfolders.append(sub_subfolder)
 
     mock_folder_repository.get_by_name_and_parent_id.side_effect = [
         root_folder,
         subfolder,
     ]
+    mock_folder_repository.has_children.return_value = True
 
     with pytest.raises(FolderNotEmptyException):
         resource_service.delete_folder(user_path, is_recursively=False)
+    mock_folder_repository.delete_by_id.assert_not_called()
 
 
-def test_delete_folder_recursive_calls_file_deletion(
+def test_delete_folder_recursive_leaves_subtree_to_cascade(
     resource_service, mock_folder_repository, mock_file_repository
 ):
     user = UserEntity(id="user-123", username="testuser")
@@ -145,26 +233,54 @@ def test_delete_folder_recursive_calls_file_deletion(
     parent_folder = FolderEntity(
         id="folder-123", name="parent_folder", parent_folder_id=root_folder.id
     )
-    subfolder = FolderEntity(id="folder-456", name="subfolder", parent_folder_id=parent_folder.id)
-    file_in_subfolder = MagicMock()
-
-    parent_folder.subfolders.append(subfolder)
-    subfolder.files.append(file_in_subfolder)
     mock_folder_repository.get_by_name_and_parent_id.side_effect = [
         root_folder,
         parent_folder,
     ]
+    mock_folder_repository.collect_descendant_ids.return_value = ["folder-456"]
+    mock_file_repository.get_ids_by_folder_ids.return_value = ["file-1"]
 
-    with patch.object(resource_service, "_delete_file_data") as mock_delete_file_data, patch.object(
-        resource_service, "_delete_folder", wraps=resource_service._delete_folder
-    ):
+    with patch.object(resource_service, "_delete_files_data") as mock_delete_files_data:
+        resource_service.delete_folder(user_path, is_recursively=True)
+
+    subtree_ids = ["folder-123", "folder-456"]
+    mock_folder_repository.has_children.assert_not_called()
+    mock_file_repository.get_ids_by_folder_ids.assert_called_once_with(subtree_ids)
+    mock_folder_repository.delete_by_id.assert_called_once_with("folder-123")
+    mock_delete_files_data.assert_called_once_with(["file-1"])
+
+
+def test_delete_sharing_user_folder_removes_shares(
+    resource_service, mock_folder_repository, mock_link_repository, mock_shared_file_repository
+):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("Shared/owner", user)
+    root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
+    shared_folder = FolderEntity(
+        id="folder-shared", name="Shared", parent_folder_id=root_folder.id, type=FolderType.SHARED
+    )
+    sharing_folder = FolderEntity(
+        id="folder-owner",
+        name="owner",
+        parent_folder_id=shared_folder.id,
+        owner_id=user.id,
+        type=FolderType.SHARING_USER,
+    )
+    mock_folder_repository.get_by_name_and_parent_id.side_effect = [
+        root_folder,
+        shared_folder,
+        sharing_folder,
+    ]
+    mock_folder_repository.collect_descendant_ids.return_value = []
+    mock_link_repository.get_target_file_ids.return_value = ["file-1", "file-2"]
+
+    with patch.object(resource_service, "_delete_files_data"):
         resource_service.delete_folder(user_path, is_recursively=True)
 
-        mock_delete_file_data.assert_called_once_with(file_in_subfolder)
-        resource_service._delete_folder.assert_called_with(subfolder, is_recursively=True)
-        mock_file_repository.delete.assert_called_once_with(file_in_subfolder)
-        mock_folder_repository.delete.assert_any_call(subfolder)
-        mock_folder_repository.delete.assert_any_call(parent_folder)
+    mock_shared_file_repository.delete_many.assert_called_once_with(
+        ["file-1", "file-2"], "user-123"
+    )
+    mock_folder_repository.delete_by_id.assert_called_once_with("folder-owner")
 
 
 def test_delete_folder_forbidden_root(resource_service):
@@ -187,31 +303,52 @@ def test_create_file_success(resource_service, mock_folder_repository, mock_file
         root_folder,
         subfolder,
     ]
+    mock_folder_repository.child_name_exists.return_value = False
 
     with patch.object(resource_service, "_save_file_data") as mock_save_file_data:
-        resource_service.create_file(user_path, data=b"file content", size=10)
+        resource_service.create_file(user_path, data=BytesIO(b"file content"))
         mock_save_file_data.assert_called_once()
         mock_file_repository.save.assert_called_once()
 
 
-def test_create_file_with_duplicate_name(resource_service, mock_folder_repository):
+def test_create_file_storage_failure_removes_row(
+    resource_service, mock_folder_repository, mock_file_repository
+):
     user = UserEntity(id="user-123", username="testuser")
-    user_path = UserPath("subfolder/existing_file.txt", user)
+    user_path = UserPath("subfolder/file.txt", user)
     root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
     subfolder = FolderEntity(
         id="folder-123", name="subfolder", parent_folder_id=root_folder.id, type=FolderType.NORMAL
     )
-    existing_file = FileEntity(id="file-123", name="existing_file.txt", owner=user, size=10)
 
-    subfolder.files.append(existing_file)
+    mock_folder_repository.get_by_name_and_parent_id.side_effect = [
+        root_folder,
+        subfolder,
+    ]
+    mock_folder_repository.child_name_exists.return_value = False
+
+    with patch.object(resource_service, "_save_file_data", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            resource_service.create_file(user_path, data=BytesIO(b"file content"))
+
+    mock_file_repository.delete.assert_called_once_with(mock_file_repository.save.return_value)
 
+
+def test_create_file_with_duplicate_name(resource_service, mock_folder_repository):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("subfolder/existing_file.txt", user)
+    root_folder = FolderEntity(id="folder-root", name=user_path.root_folder_name, owner=user)
+    subfolder = FolderEntity(
+        id="folder-123", name="subfolder", parent_folder_id=root_folder.id, type=FolderType.NORMAL
+    )
     mock_folder_repository.get_by_name_and_parent_id.side_effect = [
         root_folder,
         subfolder,
     ]
+    mock_folder_repository.child_name_exists.return_value = True
 
     with pytest.raises(ResourceAlreadyExistsException):
-        resource_service.create_file(user_path, data=b"file content", size=10)
+        resource_service.create_file(user_path, data=BytesIO(b"file content"))
 
 
 def test_get_file_not_found(resource_service, mock_file_repository):
@@ -223,26 +360,161 @@ def test_get_file_not_found(resource_service, mock_file_repository):
         resource_service.get_file(user_path)
 
 
+def test_create_file_force_replaces_existing_file(
+    resource_service, mock_folder_repository, mock_file_repository, mock_link_repository
+):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("test_file", user)
+    root_folder = FolderEntity(
+        id="folder-root", name=user_path.root_folder_name, owner=user, type=FolderType.NORMAL
+    )
+    existing_file = FileEntity(id="file-old", name="test_file", owner=user, size=1)
+
+    mock_folder_repository.get_by_name_and_parent_id.return_value = root_folder
+    mock_folder_repository.find_child.return_value = (ResourceType.FILE, "file-old")
+    mock_folder_repository.child_name_exists.return_value = False
+    mock_file_repository.get_by_id.return_value = existing_file
+    mock_link_repository.delete_by_file_id.return_value = []
+
+    with patch.object(resource_service, "_save_file_data"):
+        with patch.object(resource_service, "_delete_files_data") as mock_delete_files_data:
+            resource_service.create_file(user_path, BytesIO(b"new"), force=True)
+
+    mock_file_repository.delete.assert_called_once_with(existing_file)
+    mock_file_repository.save.assert_called_once()
+    mock_delete_files_data.assert_called_once_with(["file-old"])
+
+
+def test_create_file_force_keeps_replaced_data_when_save_fails(
+    resource_service,
+    storage_service,
+    mock_folder_repository,
+    mock_file_repository,
+    mock_link_repository,
+):
+    user = UserEntity(id="user-123", username="testuser")
+    user_path = UserPath("test_file", user)
+    root_folder = FolderEntity(
+        id="folder-root", name=user_path.root_folder_name, owner=user, type=FolderType.NORMAL
+    )
+    existing_file = FileEntity(id="file-old", name="test_file", owner=user, size=3)
+    storage_service.save_file(data=BytesIO(b"old"), file=existing_file)
+
+    mock_folder_repository.get_by_name_and_parent_id.return_value = root_folder
+    mock_folder_repository.find_child.return_value = (ResourceType.FILE, "file-old")
+    mock_folder_repository.child_name_exists.return_value = False
+    mock_file_repository.get_by_id.return_value = existing_file
+    mock_file_repository.save.side_effect = RuntimeError("save failed")
+    mock_link_repository.delete_by_file_id.return_value = []
+
+    with pytest.raises(RuntimeError, match="save failed"):
+        resource_service.create_file(user_path, BytesIO(b"new"), force=True)
+
+    assert storage_service.get_file(existing_file).read() == b"old"
+
+
 def test_create_file_empty_name_forbidden(resource_service):
     user = UserEntity(id="user-123", username="testuser")
     user_path = UserPath("", user)
 
     with pytest.raises(ForbiddenActionException):
-        resource_service.create_file(user_path, data=b"file content", size=10)
+        resource_service.create_file(user_path, data=BytesIO(b"file content"))
 
 
-def test_delete_file_success(resource_service, mock_file_repository):
+@patch.object(PathResolver, "resolve_any")
+def test_delete_file_or_link_file(
+    mock_resolve_any, resource_service, mock_file_repository, mock_link_repository
+):
+    user = UserEntity(id="user-123", username="testuser")
+    file = MagicMock()
+    mock_resolve_any.return_value = (ResourceType.FILE, "file-1")
+    mock_file_repository.get_by_id.return_value = file
+    mock_link_repository.delete_by_file_id.return_value = []
+
+    with patch.object(resource_service, "_delete_files_data") as mock_delete_files_data:
+        resource_service.delete_file_or_link(UserPath("file.txt", user))
+
+    mock_resolve_any.assert_called_once_with(UserPath("file.txt", user))
+    mock_file_repository.delete.assert_called_once_with(file)
+    mock_delete_files_data.assert_called_once_with([file.id])
+
+
+@patch.object(PathResolver, "resolve_any")
+def test_delete_file_or_link_last_shared_link(
+    mock_resolve_any,
+    resource_service,
+    mock_folder_repository,
+    mock_link_repository,
+    mock_shared_file_repository,
+):
+    user = UserEntity(id="user-123", username="testuser")
+    link = LinkEntity(id="link-1", folder_id="folder-1", owner_id=user.id, target_file_id="file-1")
+    folder = SimpleNamespace(type=FolderType.SHARING_USER, links=[link])
+    mock_resolve_any.return_value = (ResourceType.LINK, "link-1")
+    mock_link_repository.get_by_id.return_value = link
+    mock_folder_repository.get_by_id.return_value = folder
+
+    resource_service.delete_file_or_link(UserPath("Shared/owner/file.txt", user))
+
+    mock_shared_file_repository.delete_shared_files_from_users.assert_called_once_with(
+        "file-1", user.id
+    )
+    mock_link_repository.delete.assert_called_once_with(link)
+    mock_folder_repository.delete.assert_called_once_with(folder)
+
+
+@patch.object(PathResolver, "resolve_any")
+def test_delete_file_or_link_folder(mock_resolve_any, resource_service):
+    user = UserEntity(id="user-123", username="testuser")
+    mock_resolve_any.return_value = (ResourceType.FOLDER, "folder-1")
+
+    with pytest.raises(ForbiddenActionException):
+        resource_service.delete_file_or_link(UserPath("folder", user))
+
+
+def test_unshare_file(
+    resource_service, mock_folder_repository, mock_link_repository, mock_shared_file_repository
+):
+    mock_link_repository.delete_by_file_id_and_owner_ids.return_value = ["folder-1"]
+
+    resource_service.unshare_file("file-1", ["user-1", "user-2"])
+
+    mock_link_repository.delete_by_file_id_and_owner_ids.assert_called_once_with(
+        "file-1", ["user-1", "user-2"]
+    )
+    mock_folder_repository.delete_empty.assert_called_once_with(
+        ["folder-1"], FolderType.SHARING_USER
+    )
+    mock_shared_file_repository.delete_by_file_id_and_user_ids.assert_called_once_with(
+        "file-1", ["user-1", "user-2"]
+    )
+
+
+def test_unshare_file_without_users(resource_service, mock_link_repository):
+    resource_service.unshare_file("file-1", [])
+
+    mock_link_repository.delete_by_file_id_and_owner_ids.assert_not_called()
+
+
+def test_delete_file_success(
+    resource_service, mock_file_repository, mock_folder_repository, mock_link_repository
+):
     user = UserEntity(id="user-123", username="testuser")
     user_path = UserPath("subfolder/file.txt", user)
     file = MagicMock()
     file.owner_id = user.id
 
     mock_file_repository.get_by_name_and_parent.return_value = file
+    mock_link_repository.delete_by_file_id.return_value = ["folder-1", "folder-2"]
 
-    with patch.object(resource_service, "_delete_file_data") as mock_delete_file_data:
+    with patch.object(resource_service, "_delete_files_data") as mock_delete_files_data:
         resource_service.delete_file(user_path)
-        mock_delete_file_data.assert_called_once_with(file)
+        mock_delete_files_data.assert_called_once_with([file.id])
         mock_file_repository.delete.assert_called_once_with(file)
+        mock_link_repository.delete_by_file_id.assert_called_once_with(file.id)
+        mock_folder_repository.delete_empty.assert_called_once_with(
+            ["folder-1", "folder-2"], FolderType.SHARING_USER
+        )
 
 
 def test_create_root_folder_success(resource_service, mock_folder_repository):
@@ -284,7 +556,7 @@ def test_get_folder_by_id(resource_service):
     result = resource_service.get_folder_by_id(folder_id)
 
     assert result == folder
-    resource_service._folder_repository.get_by_id.assert_called_once_with(folder_id)
+    resource_service._folder_repository.get_by_id.assert_called_once_with(folder_id, options=())
 
 
 def test_get_folder_by_id_no_folder(resource_service):
@@ -303,7 +575,7 @@ def test_get_public_folder(resource_service):
     result = resource_service.get_public_folder(folder_id)
 
     assert result == folder
-    resource_service._folder_repository.get_by_id.assert_called_once_with(folder_id)
+    resource_service._folder_repository.get_by_id.assert_called_once_with(folder_id, options=())
 
 
 def test_get_public_folder_not_public(resource_service):
@@ -390,9 +662,8 @@ def test_get_verified_file_protected(resource_service):
     file = FileEntity(
         id=file_id, name="test_file", privacy=Privacy.PROTECTED, owner_id="user-123", size=10
     )
-    file.shared_to = ["testuser"]
-
     resource_service._file_repository.get_by_id.return_value = file
+    resource_service._file_repository.is_shared_with.return_value = True
 
     token = "Bearer valid_token"
     user = UserEntity(id="user-456", username="testuser")
@@ -404,6 +675,23 @@ def test_get_verified_file_protected(resource_service):
         result = resource_service.get_verified_file(file_id, token)
         assert result == file
         resource_service._file_repository.get_by_id.assert_called_once_with(file_id)
+        resource_service._file_repository.is_shared_with.assert_called_once_with(file_id, user.id)
+
+
+def test_get_verified_file_resolves_token_once(resource_service):
+    file = FileEntity(
+        id="file-123", name="test_file", privacy=Privacy.PRIVATE, owner_id="user-123", size=10
+    )
+    resource_service._file_repository.get_by_id.return_value = file
+    user = UserEntity(id="user-123", username="testuser")
+
+    with patch(
+        "skylock.service.resource_service.get_user_from_jwt", return_value=user
+    ) as mock_user_from_jwt:
+        resource_service.get_verified_file("file-123", "Bearer valid_token")
+        resource_service.get_verified_file("file-123", "Bearer valid_token")
+
+    mock_user_from_jwt.assert_called_once()
 
 
 def test_get_verified_file_protected_not_shared(resource_service):
@@ -411,9 +699,8 @@ def test_get_verified_file_protected_not_shared(resource_service):
     file = FileEntity(
         id=file_id, name="test_file", privacy=Privacy.PROTECTED, owner_id="user-123", size=10
     )
-    file.shared_to = ["someone"]
-
     resource_service._file_repository.get_by_id.return_value = file
+    resource_service._file_repository.is_shared_with.return_value = False
 
     token = "Bearer valid_token"
     user = UserEntity(id="user-789", username="testuser")
@@ -431,8 +718,6 @@ def test_get_verified_file_protected_owner(resource_service):
     file = FileEntity(
         id=file_id, name="test_file", privacy=Privacy.PROTECTED, owner_id="user-123", size=10
     )
-    file.shared_to = ["user-456"]
-
     resource_service._file_repository.get_by_id.return_value = file
 
     token = "Bearer valid_token"
@@ -604,10 +889,14 @@ def test_potential_file_import_file_shared_no_user(mock_get_user_by_id, resource
 
 @patch.object(ResourceService, "get_file_by_id")
 @patch.object(UserPath, "root_folder_of")
-@patch.object(ResourceService, "get_folder")
+@patch.object(PathResolver, "find_folder")
 @patch.object(ResourceService, "create_link_to_file")
 def test_potential_file_import_file_existing_folder_creating_file(
-    mock_create_link_to_file, mock_get_folder, mock_root_folder_of, mock_get_user_by_id, resource_service
+    mock_create_link_to_file,
+    mock_find_folder,
+    mock_root_folder_of,
+    mock_get_user_by_id,
+    resource_service,
 ):
 
     user = UserEntity(id="user-789", username="testuser")
@@ -628,16 +917,24 @@ def test_potential_file_import_file_existing_folder_creating_file(
 
     resource_service.potential_file_import("1", 2)
 
-    mock_get_folder.assert_called_once_with(UserPath("/home/Shared/testuser", user))
-    mock_create_link_to_file.assert_called_once_with(UserPath("/home/Shared/testuser/test_file", user), file)
+    mock_find_folder.assert_called_once_with(UserPath("/home/Shared/testuser", user))
+    mock_create_link_to_file.assert_called_once_with(
+        UserPath("/home/Shared/testuser/test_file", user), file
+    )
+
 
 @patch.object(ResourceService, "get_file_by_id")
 @patch.object(UserPath, "root_folder_of")
-@patch.object(ResourceService, "get_folder")
+@patch.object(PathResolver, "find_folder")
 @patch.object(ResourceService, "create_link_to_file")
 @patch.object(ResourceService, "create_folder")
 def test_potential_file_import_file_shared_no_existing_folder(
-    mock_create_folder, mock_create_link_to_file, mock_get_folder, mock_root_folder_of, mock_get_user_by_id, resource_service
+    mock_create_folder,
+    mock_create_link_to_file,
+    mock_find_folder,
+    mock_root_folder_of,
+    mock_get_user_by_id,
+    resource_service,
 ):
 
     user = UserEntity(id="user-789", username="testuser")
@@ -655,22 +952,28 @@ def test_potential_file_import_file_shared_no_existing_folder(
     resource_service._user_repository.get_by_id.return_value = user
 
     mock_root_folder_of.return_value = UserPath("/home", user)
-    mock_get_folder.side_effect = ResourceNotFoundException("hi")
+    mock_find_folder.return_value = None
 
     resource_service.potential_file_import("1", 2)
 
     mock_create_folder.assert_called_once_with(
         UserPath("/home/Shared/testuser", user), Privacy.PRIVATE, FolderType.SHARING_USER
     )
-    mock_create_link_to_file.assert_called_once_with(UserPath("/home/Shared/testuser/test_file", user), file)
+    mock_create_link_to_file.assert_called_once_with(
+        UserPath("/home/Shared/testuser/test_file", user), file
+    )
 
 
 @patch.object(ResourceService, "get_file_by_id")
 @patch.object(UserPath, "root_folder_of")
-@patch.object(ResourceService, "get_folder")
+@patch.object(PathResolver, "find_folder")
 @patch.object(ResourceService, "create_link_to_file")
 def test_potential_file_import_file_existing_folder_file_already_exists(
-    mock_create_link_to_file, mock_get_folder, mock_root_folder_of, mock_get_user_by_id, resource_service
+    mock_create_link_to_file,
+    mock_find_folder,
+    mock_root_folder_of,
+    mock_get_user_by_id,
+    resource_service,
 ):
 
     user = UserEntity(id="user-789", username="testuser")
@@ -692,26 +995,48 @@ def test_potential_file_import_file_existing_folder_file_already_exists(
 
     assert resource_service.potential_file_import("1", 2) == None
 
-    mock_get_folder.assert_called_once_with(UserPath("/home/Shared/testuser", user))
+    mock_find_folder.assert_called_once_with(UserPath("/home/Shared/testuser", user))
 
 
-def test_zip_exists_force(resource_service):
+def test_prepare_zip_force(resource_service, mock_file_repository):
     user = UserEntity(id="user-789", username="testuser")
-    assert resource_service.zip_exists(UserPath("path", user), True) == False
+    folder = FolderEntity(id="folder-1", name="path", parent_folder_id="root-1")
 
+    with patch.object(PathResolver, "folder_from_path", return_value=folder):
+        assert resource_service.prepare_zip(UserPath("path", user), True) is folder
+    mock_file_repository.name_exists_in_folder.assert_not_called()
 
-@patch.object(PathResolver, "file_from_path")
-def test_zip_exists_resource_not_found(mock_file_from_path, resource_service):
+
+def test_prepare_zip_archive_not_found(resource_service, mock_file_repository):
     user = UserEntity(id="user-789", username="testuser")
+    folder = FolderEntity(id="folder-1", name="path", parent_folder_id="root-1")
+    mock_file_repository.name_exists_in_folder.return_value = False
+
+    with patch.object(PathResolver, "folder_from_path", return_value=folder):
+        assert resource_service.prepare_zip(UserPath("path", user), False) is folder
+    mock_file_repository.name_exists_in_folder.assert_called_once_with("root-1", "path.zip")
 
-    mock_file_from_path.side_effect = ResourceNotFoundException("zip")
-    assert resource_service.zip_exists(UserPath("path", user), False) == False
 
-def test_zip_exists_resource_found(resource_service):
+def test_prepare_zip_archive_found(resource_service, mock_file_repository):
     user = UserEntity(id="user-789", username="testuser")
+    folder = FolderEntity(id="folder-1", name="path", parent_folder_id="root-1")
+    mock_file_repository.name_exists_in_folder.return_value = True
+
+    with patch.object(PathResolver, "folder_from_path", return_value=folder):
+        with pytest.raises(ResourceAlreadyExistsException):
+            resource_service.prepare_zip(UserPath("path", user), False)
+
+
+def test_prepare_zip_root_archive_found(resource_service, mock_file_repository):
+    user = UserEntity(id="user-789", username="testuser")
+    root = FolderEntity(id="root-1", name="testuser", parent_folder_id=None)
+    mock_file_repository.name_exists_in_folder.return_value = True
+
+    with patch.object(PathResolver, "folder_from_path", return_value=root):
+        with pytest.raises(ResourceAlreadyExistsException):
+            resource_service.prepare_zip(UserPath("", user), False)
+    mock_file_repository.name_exists_in_folder.assert_called_once_with("root-1", ".zip")
 
-    with pytest.raises(ResourceAlreadyExistsException):
-        resource_service.zip_exists(UserPath("path", user), False)
 
 def test_create_link_to_file_link_exists(resource_service):
     user = UserEntity(id="user-789", username="testuser")
@@ -725,7 +1050,7 @@ def test_create_link_to_file_link_exists(resource_service):
         owner=user,
     )
 
-    resource_service._link_repository.get_by_file_id_and_owner_id.return_value = True
+    resource_service._link_repository.insert_unique.return_value = None
 
     with pytest.raises(ResourceAlreadyExistsException):
         resource_service.create_link_to_file(user_path, file)
@@ -743,18 +1068,19 @@ def test_create_link_to_file(mock_folder_from_path, resource_service):
         size=10,
         owner=user,
     )
-    folder=FolderEntity(id="folder-456", name=user_path.root_folder_name, owner=user)
+    folder = FolderEntity(id="folder-456", name=user_path.root_folder_name, owner=user)
     link = LinkEntity(
-        name='home',
-        folder=folder,
-        owner=user,
-        resource_type='file',
-        target_file=file
+        name="home", folder=folder, owner=user, resource_type="file", target_file=file
     )
 
-
-    resource_service._link_repository.get_by_file_id_and_owner_id.return_value = None
-    resource_service._link_repository.save.return_value = link
+    resource_service._link_repository.insert_unique.return_value = link
     mock_folder_from_path.return_value = folder
 
-    assert resource_service.create_link_to_file(user_path, file) == link
\ No newline at end of file
+    assert resource_service.create_link_to_file(user_path, file) == link
+    resource_service._link_repository.insert_unique.assert_called_once_with(
+        name="home",
+        folder_id=folder.id,
+        owner_id=user.id,
+        resource_type="file",
+        target_file_id=file.id,
+    )
@@ -23,3 +23,11 @@ def test_generate_download_url_for_file(url_generator):
     file_id = "abcde"
     expected_url = "/api/v1/shared/files/download/id/abcde"
     assert url_generator.generate_download_url_for_file(file_id) == expected_url
+
+
+def test_generate_urls_for_files(url_generator):
+    assert url_generator.generate_urls_for_files(iter(["1", "2"])) == ["/files/1", "/files/2"]
+
+
+def test_generate_urls_for_folders(url_generator):
+    assert url_generator.generate_urls_for_folders(["3"]) == ["/folders/3"]
@@ -13,7 +13,10 @@ from skylock.database.models import UserEntity
 from skylock.database.repository import UserRepository
 from skylock.api.models import Token
 
-from skylock.service.user_service import UserService
+from skylock.service.user_service import DUMMY_PASSWORD_HASH, UserService
+
+# minimal argon2 parameters; the production cost only slows the tests down
+TEST_PASSWORD_HASHER = argon2.PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
 
 
 @pytest.fixture
@@ -23,7 +26,9 @@ def mock_user_repository():
 
 @pytest.fixture
 def user_service(mock_user_repository):
-    return UserService(user_repository=mock_user_repository, redis_mem=MagicMock())
+    service = UserService(user_repository=mock_user_repository, redis_mem=MagicMock())
+    service.password_hasher = TEST_PASSWORD_HASHER
+    return service
 
 
 @pytest.fixture
@@ -32,7 +37,7 @@ def user_data():
         "id": str(uuid.uuid4()),
         "username": "testuser",
         "password": "password123",
-        "hashed_password": argon2.PasswordHasher().hash("password123"),
+        "hashed_password": TEST_PASSWORD_HASHER.hash("password123"),
         "email": "test@example.com",
     }
 
@@ -48,21 +53,25 @@ def user_entity(user_data):
 
 
 @patch("skylock.service.user_service.send_mail")
-def test_register_user_successful(send_mail, user_service, mock_user_repository, user_data, user_entity):
-    mock_user_repository.get_by_username.return_value = None
-    mock_user_repository.get_by_email.return_value = None
+def test_register_user_successful(
+    send_mail, user_service, mock_user_repository, user_data, user_entity
+):
+    mock_user_repository.is_username_or_email_taken.return_value = False
     mock_user_repository.save.return_value = user_entity
 
     user_service.register_user(user_data["username"], user_data["email"])
 
+    mock_user_repository.is_username_or_email_taken.assert_called_once_with(
+        user_data["username"], user_data["email"]
+    )
+
     user_service.redis_mem.setex.assert_called_once_with(
         f"2fa:{user_data["username"]}", user_service.token_life + 5, ANY
     )
 
 
 def test_register_user_already_exists(user_service, mock_user_repository, user_data, user_entity):
-    mock_user_repository.get_by_username.return_value = user_entity
-    mock_user_repository.get_by_email.return_value = user_entity
+    mock_user_repository.is_username_or_email_taken.return_value = True
 
     with pytest.raises(UserAlreadyExists):
         user_service.register_user(user_data["username"], "random_email")
@@ -72,7 +81,7 @@ def test_register_user_already_exists(user_service, mock_user_repository, user_d
 
 
 def test_verify_2FA_success(mock_user_repository, user_service, user_data, user_entity):
-    mock_user_repository.save.return_value = user_entity
+    mock_user_repository.insert_unique.return_value = user_entity
     user_service.redis_mem.get.return_value = f"2fa:{user_data["username"]}"
 
     with patch("skylock.service.user_service.pyotp.TOTP.verify", return_value=True) as totp_verify:
@@ -87,6 +96,20 @@ def test_verify_2FA_success(mock_user_repository, user_service, user_data, user_
     totp_verify.assert_called_once_with("test_code")
 
 
+def test_verify_2FA_user_already_exists(mock_user_repository, user_service, user_data):
+    mock_user_repository.insert_unique.return_value = None
+    user_service.redis_mem.get.return_value = f"2fa:{user_data["username"]}"
+
+    with patch("skylock.service.user_service.pyotp.TOTP.verify", return_value=True):
+        with pytest.raises(UserAlreadyExists):
+            user_service.verify_2fa(
+                user_data["username"],
+                user_data["password"],
+                "test_code",
+                user_data["email"],
+            )
+
+
 def test_verify_2FA_wrong_code(user_service, user_data):
     user_service.redis_mem.get.return_value = None
 
@@ -127,3 +150,25 @@ def test_login_user_not_found(user_service, mock_user_repository, user_data):
 
     with pytest.raises(InvalidCredentialsException):
         user_service.login_user(user_data["username"], user_data["password"])
+
+
+def test_login_user_not_found_still_verifies_password(
+    user_service, mock_user_repository, user_data
+):
+    mock_user_repository.get_by_username.return_value = None
+
+    with patch.object(user_service, "_verify_password", return_value=True) as verify_password:
+        with pytest.raises(InvalidCredentialsException):
+            user_service.login_user(user_data["username"], user_data["password"])
+
+    verify_password.assert_called_once_with(DUMMY_PASSWORD_HASH, user_data["password"])
+
+
+def test_find_shared_to_users(user_service, mock_user_repository):
+    mock_user_repository.get_existing_usernames.return_value = {"alice", "carol"}
+
+    found = user_service.find_shared_to_users(["carol", "bob", "alice", "carol"])
+
+    assert found == ["carol", "alice"]
+    mock_user_repository.get_existing_usernames.assert_called_once_with(["carol", "bob", "alice"])
+    mock_user_repository.get_by_username.assert_not_called()
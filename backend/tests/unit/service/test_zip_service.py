@@ -0,0 +1,80 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from skylock.database.models import FolderEntity
+from skylock.service import dramatiq_tasks, zip_service as zip_service_module
+from skylock.service.zip_service import RELEASE_ZIP_LOCK_SCRIPT, ZipService
+from skylock.utils.exceptions import ZipQueueError
+
+
+@pytest.fixture
+def mock_redis_mem():
+    return MagicMock()
+
+
+@pytest.fixture
+def zip_service(mock_redis_mem):
+    return ZipService(MagicMock(), redis_mem=mock_redis_mem)
+
+
+def test_acquire_zip_lock(zip_service, mock_redis_mem):
+    mock_redis_mem.set.return_value = True
+
+    task_key, token = zip_service.acquire_zip_lock("user-123", "folder")
+
+    assert task_key == "zip:user-123:folder"
+    mock_redis_mem.set.assert_called_once_with(task_key, token, nx=True, ex=3600)
+
+
+def test_acquire_zip_lock_already_held(zip_service, mock_redis_mem):
+    mock_redis_mem.set.return_value = None
+
+    with pytest.raises(ZipQueueError):
+        zip_service.acquire_zip_lock("user-123", "folder")
+
+
+def test_release_zip_lock(zip_service, mock_redis_mem):
+    mock_redis_mem.eval.return_value = 1
+
+    assert zip_service.release_zip_lock("zip:user-123:folder", "token")
+    mock_redis_mem.eval.assert_called_once_with(
+        RELEASE_ZIP_LOCK_SCRIPT, 1, "zip:user-123:folder", "token"
+    )
+
+
+def test_release_zip_lock_held_by_another_task(zip_service, mock_redis_mem):
+    mock_redis_mem.eval.return_value = 0
+
+    assert not zip_service.release_zip_lock("zip:user-123:folder", "stale-token")
+
+
+def test_create_zip_from_folder_closes_buffer_on_failure(zip_service):
+    zip_buffer = io.BytesIO()
+    folder = FolderEntity(id="folder-1", name="folder", files=[], subfolders=[])
+
+    with patch.object(
+        zip_service_module.tempfile, "SpooledTemporaryFile", return_value=zip_buffer
+    ), patch.object(ZipService, "_write_zip_entries", side_effect=OSError("file missing")):
+        with pytest.raises(OSError, match="file missing"):
+            zip_service.create_zip_from_folder(folder)
+
+    assert zip_buffer.closed
+
+
+@patch.object(dramatiq_tasks, "ResourceService")
+@patch.object(dramatiq_tasks, "UserRepository")
+@patch.object(dramatiq_tasks, "get_db_session", side_effect=lambda: iter([MagicMock()]))
+@patch.object(dramatiq_tasks, "FileStorageService")
+@patch.object(dramatiq_tasks, "ZipService")
+def test_create_zip_task_releases_lock_on_failure(mock_zip_service_class, *_mocks):
+    zip_service = mock_zip_service_class.return_value
+    zip_service.create_zip_from_folder.side_effect = RuntimeError("zipping failed")
+
+    with pytest.raises(RuntimeError, match="zipping failed"):
+        dramatiq_tasks.create_zip_task(
+            "user-123", "folder", False, task_name="zip:user-123:folder", lock_token="token"
+        )
+
+    zip_service.release_zip_lock.assert_called_once_with("zip:user-123:folder", "token")
@@ -87,3 +87,20 @@ def test_user_path_proper_file_name():
     user_path = UserPath(path=path, owner=user)
 
     assert user_path.path == "file.txt"
+
+
+def test_user_path_derived_values_are_cached():
+    user = UserEntity(id=1, username="testuser")
+    user_path = UserPath(path="some/path", owner=user)
+
+    assert user_path.parent is user_path.parent
+    assert user_path.parents is user_path.parents
+    assert user_path.parent == UserPath(path="some", owner=user)
+    assert user_path.parent.parent.is_root_folder()
+
+
+def test_user_path_abs_path():
+    user = UserEntity(id=1, username="testuser")
+
+    assert UserPath(path="some/path", owner=user).abs_path == "/some/path"
+    assert UserPath(path="", owner=user).abs_path == "/"
@@ -1,13 +1,14 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
-from jose import jwt
+from jose import JWTError, jwt
 from unittest.mock import Mock
 
 from skylock.utils.security import (
     get_user_from_jwt,
     create_jwt_for_user,
     decode_jwt,
+    strip_bearer_prefix,
     ALGORITHM,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
@@ -39,6 +40,18 @@ def test_decode_jwt():
     assert decoded_token["exp"] == payload["exp"]
 
 
+def test_decode_jwt_requires_expiration():
+    token = jwt.encode({"id": 1, "sub": "testuser"}, JWT_SECRET, algorithm=ALGORITHM)
+
+    with pytest.raises(JWTError):
+        decode_jwt(token)
+
+
+def test_strip_bearer_prefix():
+    assert strip_bearer_prefix("Bearer abc.Bearer .def") == "abc.Bearer .def"
+    assert strip_bearer_prefix("abc.def") == "abc.def"
+
+
 def test_get_user_from_jwt_valid_token():
     user = db_models.UserEntity(id=1, username="testuser")
     user_repository = Mock()
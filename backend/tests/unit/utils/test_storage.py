@@ -1,6 +1,7 @@
 import pytest
 import uuid
-from skylock.utils.storage import FileStorageService
+from io import BytesIO
+from skylock.utils.storage import FileStorageService, iter_chunks, stream_size
 from skylock.database.models import FileEntity, FolderEntity, UserEntity
 
 
@@ -31,26 +32,32 @@ def test_save_file(temp_storage_service, test_file):
     """Test saving a file to storage."""
     data = b"This is test file content"
 
-    temp_storage_service.save_file(data, test_file)
+    temp_storage_service.save_file(BytesIO(data), test_file)
 
     expected_path = temp_storage_service.storage_path / test_file.id
     assert expected_path.exists()
     assert expected_path.read_bytes() == data
 
 
+def test_save_file_leaves_no_partial_file(temp_storage_service, test_file):
+    temp_storage_service.save_file(BytesIO(b"This is test file content"), test_file)
+
+    assert [path.name for path in temp_storage_service.storage_path.iterdir()] == [test_file.id]
+
+
 def test_get_file(temp_storage_service, test_file):
     data = b"This is test file content"
 
-    temp_storage_service.save_file(data, test_file)
+    temp_storage_service.save_file(BytesIO(data), test_file)
 
-    file_stream = temp_storage_service.get_file(test_file)
-    assert file_stream.read() == data
+    with temp_storage_service.get_file(test_file) as file_stream:
+        assert file_stream.read() == data
 
 
 def test_delete_file(temp_storage_service, test_file):
     data = b"This is test file content"
 
-    temp_storage_service.save_file(data, test_file)
+    temp_storage_service.save_file(BytesIO(data), test_file)
 
     temp_storage_service.delete_file(test_file)
 
@@ -58,14 +65,22 @@ def test_delete_file(temp_storage_service, test_file):
     assert not expected_path.exists()
 
 
+def test_delete_files_skips_missing_data(temp_storage_service, test_file):
+    temp_storage_service.save_file(BytesIO(b"This is test file content"), test_file)
+
+    temp_storage_service.delete_files([test_file.id, str(uuid.uuid4())])
+
+    assert not (temp_storage_service.storage_path / test_file.id).exists()
+
+
 def test_save_existing_file_raises_error(temp_storage_service, test_file):
     """Test saving a file with the same name raises an error."""
     data = b"This is test file content"
 
-    temp_storage_service.save_file(data, test_file)
+    temp_storage_service.save_file(BytesIO(data), test_file)
 
     with pytest.raises(ValueError, match="File of given path: .* already exists"):
-        temp_storage_service.save_file(data, test_file)
+        temp_storage_service.save_file(BytesIO(data), test_file)
 
 
 def test_get_nonexistent_file_raises_error(temp_storage_service, test_file):
@@ -78,3 +93,18 @@ def test_delete_nonexistent_file_raises_error(temp_storage_service, test_file):
     """Test deleting a nonexistent file raises an error."""
     with pytest.raises(ValueError, match="File of given path: .* does not exist"):
         temp_storage_service.delete_file(test_file)
+
+
+def test_iter_chunks_splits_and_closes_stream():
+    stream = BytesIO(b"abcdefg")
+
+    assert list(iter_chunks(stream, chunk_size=3)) == [b"abc", b"def", b"g"]
+    assert stream.closed
+
+
+def test_stream_size_keeps_position():
+    stream = BytesIO(b"abcdefg")
+    stream.read(2)
+
+    assert stream_size(stream) == 5
+    assert stream.read() == b"cdefg"